@@ -1,18 +1,37 @@
 """Application factory module."""
 from datetime import timedelta
 import os
+import click
 from flask import Flask
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
 from config.config import config
-from config.database import db, init_db
+from config.database import configure_engine_options, db, get_pool_stats, init_db
 from app.routes.user_routes import user_bp
 from app.models.user import User
 from app.models.report import Report
-from dotenv import load_dotenv
+from app.services.report_queue import ReportQueue
+from app.services.user_cache import UserCache, UserListCache
+from app.services.user_names import UserNameFilter
+from app.services.user_purge import purge_deactivated_users
+from app.services.user_search import PrefixIndex
+from app.utils.compression import init_compression
+from app.utils.json_provider import FastJSONProvider
+from app.utils.metrics import init_metrics
+from app.utils.proxy import init_proxy_fix
+from app.utils.query_profiler import init_query_profiler
+from app.utils.rate_limit import RateLimiter
+from app.utils.password_hasher import PasswordHasher
+
+
+def _init_migrate(app):
+    """Initialize Flask-Migrate.
+
+    Flask-Migrate pulls in Alembic, which is a large share of import
+    time, so it is imported only when migrations can actually run.
+    """
+    from flask_migrate import Migrate
+    Migrate().init_app(app, db)
 
-# Create a migrate instance to be initialized with the app
-migrate = Migrate()
 
 def create_app(config_name=None):
     """Create and configure the Flask application.
@@ -23,8 +42,7 @@ def create_app(config_name=None):
     Returns:
         Flask: Configured Flask application
     """
-    # Load environment variables first
-    load_dotenv()
+    # Environment variables were loaded from .env when config.config was imported
     
     # Create Flask app
     app = Flask(__name__)
@@ -41,15 +59,42 @@ def create_app(config_name=None):
 
 
     
+    init_proxy_fix(app)
+
+    if app.config['JSON_PROVIDER'] == 'fast':
+        app.json = FastJSONProvider(app)
+
+    # Registered first so it runs after every other after_request hook
+    if app.config['COMPRESS_ENABLED']:
+        init_compression(app)
+
     # Initialize extensions
+    configure_engine_options(app)
     db.init_app(app)
-    migrate.init_app(app, db)
+    init_query_profiler(app)
+
+    # Fast startup only needs migrations for `flask db ...` commands
+    if not app.config['FAST_STARTUP'] or click.get_current_context(silent=True) is not None:
+        _init_migrate(app)
 
     jwt = JWTManager(app)# jwt initialization
+
+    app.extensions['password_hasher'] = PasswordHasher.from_config(app.config)
+    app.extensions['user_list_cache'] = UserListCache.from_config(app.config)
+    app.extensions['user_cache'] = UserCache.from_config(
+        app.config, app.extensions['user_list_cache'].generation
+    )
+    app.extensions['user_name_filter'] = UserNameFilter.from_config(
+        app.config, app.extensions['user_list_cache'].generation
+    )
+    app.extensions['report_queue'] = ReportQueue.from_config(app)
+    app.extensions['rate_limiter'] = RateLimiter.from_config(app.config)
+    app.extensions['user_search_index'] = PrefixIndex(app.extensions['user_list_cache'].generation)
     
     with app.app_context():
-        # Initialize database connection
-        init_db(app)
+        # Initialize database connection; fast startup leaves this to `flask init-db`
+        if not app.config['FAST_STARTUP']:
+            init_db(app)
         
         # Register blueprints
         app.register_blueprint(user_bp)
@@ -58,5 +103,33 @@ def create_app(config_name=None):
     @app.route('/health')
     def health_check():
         return {'status': 'healthy'}, 200
+
+    # Connection pool metrics for this worker
+    @app.route('/health/db-pool')
+    def db_pool_stats():
+        return {'pool': get_pool_stats()}, 200
+
+    # Prometheus request/DB instrumentation and /metrics
+    if app.config['METRICS_ENABLED']:
+        init_metrics(app)
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create the configured database if it does not exist."""
+        init_db(app)
+        click.echo('Database ready.')
+
+    @app.cli.command('purge-users')
+    @click.option('--grace-days', type=float, default=None,
+                  help='Days a deactivated user is kept (default: USERS_PURGE_GRACE_DAYS).')
+    @click.option('--batch-size', type=int, default=None,
+                  help='Users deleted per transaction (default: USERS_PURGE_BATCH_SIZE).')
+    def purge_users_command(grace_days, batch_size):
+        """Hard-delete deactivated users and their reports."""
+        purged = purge_deactivated_users(
+            app.config['USERS_PURGE_GRACE_DAYS'] if grace_days is None else grace_days,
+            app.config['USERS_PURGE_BATCH_SIZE'] if batch_size is None else batch_size
+        )
+        click.echo(f'Purged {purged} users.')
     
     return app
@@ -0,0 +1,157 @@
+"""ASGI serving mode.
+
+Read and report endpoints are served by async views on the asyncio
+engine, so one worker can hold many concurrent requests waiting on the
+database. They run inside a Flask request context, through the app's
+request hooks (rate limits, metrics, compression) and JSON encoding,
+exactly like the sync views they stand in for. Every other route is
+delegated to the regular Flask app through asgiref's WSGI adapter, on
+a bounded thread pool.
+"""
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgiInstance
+from flask import Flask, Response
+from werkzeug.exceptions import HTTPException
+from app import create_app
+from app.controllers.async_user_controller import AsyncUserController
+from app.utils.proxy import fix_environ
+from config.async_database import init_async_db
+
+AsyncView = Callable[..., Awaitable[tuple]]
+
+# Flask endpoints served natively in async mode
+ASYNC_VIEWS: Dict[str, AsyncView] = {
+    'user.get_all_users': AsyncUserController.get_all_users,
+    'user.get_user': AsyncUserController.get_user,
+    'user.report_user': AsyncUserController.report_user,
+}
+
+
+# asgiref's WSGI call without its thread-sensitive sync_to_async wrapper
+_run_wsgi_app = vars(WsgiToAsgiInstance)['run_wsgi_app'].func
+
+
+class _PooledWsgiInstance(WsgiToAsgiInstance):
+    """asgiref's per-request WSGI adapter, run on a thread pool.
+
+    asgiref runs the WSGI app with a thread-sensitive ``sync_to_async``,
+    i.e. on one thread per process, so delegated requests would be
+    served one at a time.
+    """
+
+    def __init__(self, wsgi_application, executor: ThreadPoolExecutor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        await sync_to_async(_run_wsgi_app, thread_sensitive=False, executor=self.executor)(self, body)
+
+
+class AsgiApp:
+    """ASGI application combining async views with the Flask app."""
+
+    def __init__(self, flask_app: Flask):
+        """Wrap a Flask application.
+
+        Args:
+            flask_app (Flask): Application created by ``create_app``
+        """
+        self.flask_app = flask_app
+        self.wsgi_executor = ThreadPoolExecutor(flask_app.config['ASGI_WSGI_THREADS'], thread_name_prefix='wsgi')
+
+    async def wsgi_app(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """Serve a request with the Flask app."""
+        await _PooledWsgiInstance(self.flask_app, self.wsgi_executor)(scope, receive, send)
+
+    def _match(self, scope: Dict[str, Any]) -> Optional[Tuple[AsyncView, Dict[str, Any]]]:
+        if scope['type'] != 'http':
+            return None
+        root_path, path = scope.get('root_path', ''), scope['path']
+        if path.startswith(root_path):
+            path = path[len(root_path):]
+        try:
+            endpoint, view_args = self.flask_app.url_map.bind('localhost').match(path, method=scope['method'])
+        except HTTPException:
+            # Not found, wrong method or a redirect: Flask answers those
+            return None
+        view = ASYNC_VIEWS.get(endpoint)
+        return (view, view_args) if view is not None else None
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+
+        route = self._match(scope)
+        if route is None:
+            await self.wsgi_app(scope, receive, send)
+            return
+
+        view, view_args = route
+        body = await _read_body(receive)
+        app = self.flask_app
+        # Same steps as Flask's full_dispatch_request, awaiting the view
+        with app.request_context(fix_environ(app, _environ(scope, body))):
+            try:
+                try:
+                    result = app.preprocess_request()
+                    if result is None:
+                        result = await view(**view_args)
+                except Exception as e:
+                    result = app.handle_user_exception(e)
+                response = app.finalize_request(result)
+            except Exception as e:
+                response = app.handle_exception(e)
+        await _send_response(send, response, include_body=scope['method'] != 'HEAD')
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.flask_app.extensions['async_db'].dispose()
+                self.flask_app.extensions['report_queue'].shutdown()
+                self.wsgi_executor.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+async def _read_body(receive: Callable) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+def _environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """Build the WSGI environ of a request the way the delegated path does."""
+    adapter = WsgiToAsgiInstance(None)
+    # build_environ reads the headers from the instance's scope
+    adapter.scope = scope
+    return adapter.build_environ(scope, io.BytesIO(body))
+
+
+async def _send_response(send: Callable, response: Response, include_body: bool = True) -> None:
+    headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response.headers.items()]
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': response.get_data() if include_body else b''})
+
+
+def create_asgi_app(config_name: Optional[str] = None) -> AsgiApp:
+    """Create the ASGI application.
+
+    Args:
+        config_name (str, optional): Configuration name. Defaults to None.
+
+    Returns:
+        AsgiApp: ASGI application serving the whole API
+    """
+    flask_app = create_app(config_name)
+    init_async_db(flask_app)
+    return AsgiApp(flask_app)
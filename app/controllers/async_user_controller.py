@@ -0,0 +1,109 @@
+"""Async user controller for the ASGI serving mode."""
+from typing import Any, Dict, Tuple
+from flask import current_app, request
+from marshmallow import ValidationError
+from app.schemas.request.report_request_dto import ReportRequestDTO
+from app.schemas.validation import get_schema
+from app.services.async_user_service import AsyncUserService
+from app.services.report_queue import ReportQueueFullError
+from app.services.user_service import UserService
+from app.utils.etag import etag_matches, page_etag, user_etag
+from app.utils.pagination import parse_page_args
+
+
+class AsyncUserController:
+    """Async views mirroring the read and report endpoints of UserController.
+
+    They run inside a Flask request context, read the request the same
+    way and return the same ``(body, status[, headers])`` tuples, so the
+    app's hooks and response encoding apply to them unchanged.
+    """
+
+    @staticmethod
+    async def get_user(user_id: int) -> Tuple[Dict[str, Any], int]:
+        """Handle get user request.
+
+        A matching ``If-None-Match`` gets a 304 after checking only the
+        user's version.
+
+        Args:
+            user_id (int): User ID
+
+        Returns:
+            tuple: Response data and status code
+        """
+        try:
+            if request.if_none_match:
+                # Revalidation only needs the version, not the full row
+                version = await AsyncUserService.get_user_version(user_id)
+                if version is None:
+                    return {'message': 'User not found'}, 404
+                etag = user_etag(user_id, version)
+                if etag_matches(request.if_none_match, etag):
+                    return '', 304, {'ETag': etag}
+
+            user = await AsyncUserService.get_user_by_id(user_id)
+            if user:
+                return {'user': user}, 200, {'ETag': user_etag(user['id'], user['version'])}
+            return {'message': 'User not found'}, 404
+        except Exception as e:
+            return {'message': 'Internal server error', 'error': str(e)}, 500
+
+    @staticmethod
+    async def get_all_users() -> Tuple[Dict[str, Any], int]:
+        """Handle get all users request.
+
+        Pages are served from and stored in the same list cache as the
+        sync controller, with the same ``ETag`` and ``Cache-Control``.
+
+        Returns:
+            tuple: Response data and status code
+        """
+        try:
+            limit, after = parse_page_args(
+                request.args,
+                current_app.config['USERS_PAGE_DEFAULT_LIMIT'],
+                current_app.config['USERS_PAGE_MAX_LIMIT']
+            )
+            headers = {'Cache-Control': f"public, max-age={current_app.config['USERS_LIST_MAX_AGE']}"}
+            page = UserService.get_cached_users_page(limit, after)
+            if page is None and request.if_none_match:
+                versions, next_cursor = await AsyncUserService.get_user_versions_page(limit, after)
+                headers['ETag'] = page_etag(versions, next_cursor)
+                if etag_matches(request.if_none_match, headers['ETag']):
+                    return '', 304, headers
+
+            if page is None:
+                page = await AsyncUserService.get_users_page(limit, after)
+            data, headers['ETag'] = page
+            if request.if_none_match and etag_matches(request.if_none_match, headers['ETag']):
+                return '', 304, headers
+            return data, 200, headers
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        except Exception as e:
+            return {'message': 'Internal server error', 'error': str(e)}, 500
+
+    @staticmethod
+    async def report_user() -> Tuple[Dict[str, Any], int]:
+        """Handle report user request.
+
+        Returns:
+            tuple: Response data and status code
+        """
+        try:
+            validated_data = get_schema(ReportRequestDTO).load(request.get_json(silent=True))
+            if current_app.config['REPORT_DURABILITY'] == 'async':
+                UserService.enqueue_report(validated_data)
+                return {'message': 'Report accepted'}, 202
+
+            await AsyncUserService.report_user(validated_data)
+            return {'message': 'User created successfully', 'user': None}, 201
+        except ReportQueueFullError:
+            return {'message': 'Server busy, please retry later'}, 503, {'Retry-After': '1'}
+        except ValidationError as e:
+            return {'message': 'Validation error', 'errors': e.messages}, 400
+        except ValueError as e:
+            return {'message': str(e)}, 409
+        except Exception as e:
+            return {'message': 'Internal server error', 'error': str(e)}, 500
@@ -1,11 +1,17 @@
 """User controller for handling HTTP requests."""
-from typing import Tuple, Dict, Any
-from flask import jsonify, request
+from datetime import datetime
+from typing import Tuple, Dict, Any, Union
+from flask import Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import create_access_token
 from marshmallow import ValidationError
 from app.schemas.request.report_request_dto import ReportRequestDTO
-from app.services.user_service import UserService
+from app.services.report_queue import ReportQueueFullError
+from app.services.user_service import UserService, VersionConflictError
 from app.schemas.user_schema import UserSchema
+from app.schemas.validation import get_schema
+from app.utils.etag import etag_matches, if_match_version, page_etag, user_etag
+from app.utils.pagination import parse_page_args
+from app.utils.password_hasher import HashingBusyError
 
 class UserController:
     """Controller class for user-related endpoints."""
@@ -19,10 +25,12 @@ class UserController:
         """
         try:
             data = request.get_json()
-            schema = UserSchema()
+            schema = get_schema(UserSchema)
             validated_data = schema.load(data)
             user = UserService.create_user(validated_data)
             return {'message': 'User created successfully', 'user': user}, 201
+        except HashingBusyError as e:
+            return {'message': 'Server busy, please retry later'}, 503, {'Retry-After': str(e.retry_after)}
         except ValidationError as e:
             return {'message': 'Validation error', 'errors': e.messages}, 400
         except ValueError as e:
@@ -30,9 +38,55 @@ class UserController:
         except Exception as e:
             return {'message': 'Internal server error', 'error': str(e)}, 500
     
+    @staticmethod
+    def bulk_create_users() -> Tuple[Dict[str, Any], int]:
+        """Handle bulk user creation request.
+
+        Invalid items and duplicates are reported per item in ``results``
+        while the remaining users are still created.
+        
+        Returns:
+            tuple: Response data and status code
+        """
+        try:
+            data = request.get_json()
+            if not isinstance(data, list) or not data:
+                return {'message': 'Request body must be a non-empty list of users'}, 400
+            max_items = current_app.config['USERS_BULK_MAX_ITEMS']
+            if len(data) > max_items:
+                return {'message': f'At most {max_items} users can be created per request'}, 400
+
+            schema = get_schema(UserSchema, many=True)
+            try:
+                validated = schema.load(data)
+                errors = {}
+            except ValidationError as e:
+                validated, errors = e.valid_data, e.messages
+
+            results = [
+                {'index': index, 'status': 'invalid', 'errors': item_errors}
+                for index, item_errors in errors.items()
+            ]
+            entries = [(index, item) for index, item in enumerate(validated) if index not in errors]
+            results.extend(UserService.bulk_create_users(
+                entries,
+                batch_size=current_app.config['USERS_BULK_BATCH_SIZE']
+            ))
+            results.sort(key=lambda result: result['index'])
+
+            created = sum(1 for result in results if result['status'] == 'created')
+            return {'created': created, 'failed': len(results) - created, 'results': results}, 200
+        except HashingBusyError as e:
+            return {'message': 'Server busy, please retry later'}, 503, {'Retry-After': str(e.retry_after)}
+        except Exception as e:
+            return {'message': 'Internal server error', 'error': str(e)}, 500
+    
     @staticmethod
     def get_user(user_id: int) -> Tuple[Dict[str, Any], int]:
         """Handle get user request.
+
+        A matching ``If-None-Match`` gets a 304 after checking only the
+        user's version.
         
         Args:
             user_id (int): User ID
@@ -41,9 +95,18 @@ class UserController:
             tuple: Response data and status code
         """
         try:
+            if request.if_none_match:
+                # Revalidation only needs the version, not the full row
+                version = UserService.get_user_version(user_id)
+                if version is None:
+                    return {'message': 'User not found'}, 404
+                etag = user_etag(user_id, version)
+                if etag_matches(request.if_none_match, etag):
+                    return '', 304, {'ETag': etag}
+
             user = UserService.get_user_by_id(user_id)
             if user:
-                return {'user': user}, 200
+                return {'user': user}, 200, {'ETag': user_etag(user['id'], user['version'])}
             return {'message': 'User not found'}, 404
         except Exception as e:
             return {'message': 'Internal server error', 'error': str(e)}, 500
@@ -51,19 +114,123 @@ class UserController:
     @staticmethod
     def get_all_users() -> Tuple[Dict[str, Any], int]:
         """Handle get all users request.
+
+        Query parameters ``limit`` and ``after`` select a page; the
+        response carries ``next_cursor`` to pass as ``after`` for the
+        following page. Rendered pages are served from the list cache
+        until the next user write. A matching ``If-None-Match`` gets a 304,
+        on a cache miss after a query of IDs and versions only.
+        
+        Returns:
+            tuple: Response data and status code
+        """
+        try:
+            limit, after = parse_page_args(
+                request.args,
+                current_app.config['USERS_PAGE_DEFAULT_LIMIT'],
+                current_app.config['USERS_PAGE_MAX_LIMIT']
+            )
+            headers = {'Cache-Control': f"public, max-age={current_app.config['USERS_LIST_MAX_AGE']}"}
+            page = UserService.get_cached_users_page(limit, after)
+            if page is None and request.if_none_match:
+                versions, next_cursor = UserService.get_user_versions_page(limit, after)
+                headers['ETag'] = page_etag(versions, next_cursor)
+                if etag_matches(request.if_none_match, headers['ETag']):
+                    return '', 304, headers
+
+            if page is None:
+                page = UserService.get_users_page(limit, after)
+            data, headers['ETag'] = page
+            if request.if_none_match and etag_matches(request.if_none_match, headers['ETag']):
+                return '', 304, headers
+            return data, 200, headers
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        except Exception as e:
+            return {'message': 'Internal server error', 'error': str(e)}, 500
+    
+    @staticmethod
+    def search_users() -> Tuple[Dict[str, Any], int]:
+        """Handle user search request.
+
+        Query parameter ``q`` is matched against username, first name
+        and last name; ``limit`` and ``after`` page through the ranked
+        results.
+        
+        Returns:
+            tuple: Response data and status code
+        """
+        try:
+            query = request.args.get('q', '').strip()
+            if not query or len(query) > 80:
+                return {'message': 'q must be between 1 and 80 characters'}, 400
+            limit, after = parse_page_args(
+                request.args,
+                current_app.config['USERS_PAGE_DEFAULT_LIMIT'],
+                current_app.config['USERS_PAGE_MAX_LIMIT']
+            )
+            users, next_cursor = UserService.search_users(query, limit, after)
+            return {'users': users, 'next_cursor': next_cursor}, 200
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        except Exception as e:
+            return {'message': 'Internal server error', 'error': str(e)}, 500
+    
+    @staticmethod
+    def check_availability() -> Tuple[Dict[str, Any], int]:
+        """Handle username/email availability request.
+
+        Query parameters ``username`` and ``email``; at least one is
+        required.
         
         Returns:
             tuple: Response data and status code
         """
         try:
-            users = UserService.get_all_users()
-            return {'users': users}, 200
+            names = {field: request.args[field] for field in ('username', 'email') if request.args.get(field)}
+            if not names:
+                return {'message': 'username or email is required'}, 400
+            if len(names.get('username', '')) > 80 or len(names.get('email', '')) > 120:
+                return {'message': 'Name too long'}, 400
+            return {'available': UserService.check_availability(**names)}, 200, {'Cache-Control': 'no-store'}
         except Exception as e:
             return {'message': 'Internal server error', 'error': str(e)}, 500
     
+    @staticmethod
+    def export_users() -> Union[Response, Tuple[Dict[str, Any], int]]:
+        """Handle users export request.
+
+        Streams all users as newline-delimited JSON. The optional
+        ``updated_since`` query parameter (ISO 8601) restricts the export
+        to users changed since a previous run, including users deactivated
+        since then.
+        
+        Returns:
+            Response: Streaming NDJSON response, or error data and status code
+        """
+        updated_since = request.args.get('updated_since')
+        if updated_since:
+            try:
+                updated_since = datetime.fromisoformat(updated_since)
+            except ValueError:
+                return {'message': 'updated_since must be an ISO 8601 datetime'}, 400
+        else:
+            updated_since = None
+
+        rows = UserService.iter_users_for_export(
+            updated_since,
+            batch_size=current_app.config['USERS_EXPORT_BATCH_SIZE']
+        )
+        dumps = current_app.json.dumps
+        lines = (dumps(row) + '\n' for row in rows)
+        return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+    
     @staticmethod
     def update_user(user_id: int) -> Tuple[Dict[str, Any], int]:
         """Handle user update request.
+
+        An ``If-Match`` header carrying the user's ETag makes the update
+        conditional; it fails with 412 if the user changed since.
         
         Args:
             user_id (int): User ID
@@ -75,14 +242,24 @@ class UserController:
             data = request.get_json()
 
            ##  print(f"REQUEST {request.headers}")
+
+            expected_version = None
+            if request.if_match and not request.if_match.star_tag:
+                expected_version = if_match_version(user_id, request.if_match)
+                if expected_version is None:
+                    return {'message': 'Precondition failed'}, 412
            
-            schema = UserSchema(partial=True)
+            schema = get_schema(UserSchema, partial=True)
             validated_data = schema.load(data)
-            user = UserService.update_user(user_id, validated_data)
+            user = UserService.update_user(user_id, validated_data, expected_version)
             
             if user:
-                return {'message': 'User updated successfully', 'user': user}, 200
+                return {'message': 'User updated successfully', 'user': user}, 200, {'ETag': user_etag(user['id'], user['version'])}
             return {'message': 'User not found'}, 404
+        except VersionConflictError as e:
+            return {'message': str(e)}, 412
+        except HashingBusyError as e:
+            return {'message': 'Server busy, please retry later'}, 503, {'Retry-After': str(e.retry_after)}
         except ValidationError as e:
             return {'message': 'Validation error', 'errors': e.messages}, 400
         except ValueError as e:
@@ -107,6 +284,40 @@ class UserController:
         except Exception as e:
             return {'message': 'Internal server error', 'error': str(e)}, 500
     
+    @staticmethod
+    def deactivate_users() -> Tuple[Dict[str, Any], int]:
+        """Handle bulk user deactivation request.
+
+        The body is ``{"ids": [...]}``; IDs that do not exist or are
+        already inactive are ignored.
+
+        Returns:
+            tuple: Response data and status code
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            user_ids = data.get('ids') if isinstance(data, dict) else None
+            if (not isinstance(user_ids, list) or not user_ids
+                    or not all(type(user_id) is int for user_id in user_ids)):
+                return {'message': 'Request body must contain a non-empty list of user ids'}, 400
+            max_items = current_app.config['USERS_BULK_MAX_ITEMS']
+            if len(user_ids) > max_items:
+                return {'message': f'At most {max_items} users can be deactivated per request'}, 400
+
+            deactivated = UserService.deactivate_users(user_ids)
+            return {'deactivated': len(deactivated), 'ids': deactivated}, 200
+        except Exception as e:
+            return {'message': 'Internal server error', 'error': str(e)}, 500
+    
+    @staticmethod
+    def cache_stats() -> Tuple[Dict[str, Any], int]:
+        """Handle user cache statistics request.
+        
+        Returns:
+            tuple: Response data and status code
+        """
+        return {'cache': UserService.cache_stats()}, 200
+    
     @staticmethod
     def login() -> Tuple[Dict[str, Any], int]:
         """Handle user login request.
@@ -126,12 +337,10 @@ class UserController:
             if validated_user_dict:
                 access_token = create_access_token(identity=validated_user_dict['id'])
 
-                print(f"USER : {validated_user_dict}")
-
-                print(f"access token: {access_token}")
-
                 return {'message': 'Login successful', 'validated_user_dict': validated_user_dict, 'access_token' : access_token}, 200
             return {'message': 'Invalid credentials'}, 401
+        except HashingBusyError as e:
+            return {'message': 'Server busy, please retry later'}, 503, {'Retry-After': str(e.retry_after)}
         except Exception as e:
             return {'message': 'Internal server error', 'error': str(e)}, 500 
         
@@ -143,16 +352,44 @@ class UserController:
 
             # print(f"data = {data} ////////////////////     type = {type(data)}")
             
-            schema = ReportRequestDTO()
+            schema = get_schema(ReportRequestDTO)
             validated_data = schema.load(data)
             # print(f"validated_data = {validated_data} ////////////////////     type = {type(validated_data)}")
+            if current_app.config['REPORT_DURABILITY'] == 'async':
+                UserService.enqueue_report(validated_data)
+                return {'message': 'Report accepted'}, 202
+
             user = UserService.report_user_new(validated_data)
 
             return {'message': 'User created successfully', 'user': user}, 201
+        except ReportQueueFullError:
+            return {'message': 'Server busy, please retry later'}, 503, {'Retry-After': '1'}
         except ValidationError as e:
             return {'message': 'Validation error', 'errors': e.messages}, 400
         except ValueError as e:
             return {'message': str(e)}, 409
         except Exception as e:
             return {'message': 'Internal server error', 'error': str(e)}, 500
-    
\ No newline at end of file
+
+    @staticmethod
+    def get_most_reported_users() -> Tuple[Dict[str, Any], int]:
+        """Handle most reported users request.
+
+        Query parameters ``days`` (window size, default 7) and ``limit``
+        (default 10) are capped by configuration.
+        
+        Returns:
+            tuple: Response data and status code
+        """
+        try:
+            days = request.args.get('days', 7, type=int)
+            limit = request.args.get('limit', 10, type=int)
+            if days < 1 or limit < 1:
+                return {'message': 'days and limit must be positive'}, 400
+            days = min(days, current_app.config['REPORTS_TOP_MAX_DAYS'])
+            limit = min(limit, current_app.config['REPORTS_TOP_MAX_LIMIT'])
+
+            users = UserService.get_most_reported_users(days, limit)
+            return {'users': users, 'days': days}, 200
+        except Exception as e:
+            return {'message': 'Internal server error', 'error': str(e)}, 500
@@ -1,16 +1,36 @@
 """Report model for the application."""
+from datetime import datetime
 from config.database import db 
 
 class Report(db.Model):
     """Report Model for banned user"""
     
     __tablename__ = 'reports'
+    __table_args__ = (
+        # Per-target counts over a time range without scanning the table
+        db.Index('ix_reports_user_id_created_at', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     reason = db.Column(db.String(256), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     def __init__(self, user_id = None, reason = None):   #contructor 
         self.user_id = user_id
         self.reason = reason
-   
\ No newline at end of file
+
+
+class ReportCount(db.Model):
+    """Number of reports received by a user per day.
+
+    Maintained in the same transaction as the reports themselves, so
+    moderation queries aggregate a few rows per user instead of the raw
+    reports table.
+    """
+    
+    __tablename__ = 'report_counts'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True, index=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
@@ -19,22 +19,32 @@ class User(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     bio = db.Column(db.String(256), nullable=True)
     country = db.Column(db.String(50), nullable=True)
+    # Incremented on every update; clients send it back in If-Match
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
+    # ORM flushes also bump and check the version, so they cannot
+    # silently overwrite a concurrent update either
+    __mapper_args__ = {'version_id_col': version}
     
-    def __init__(self, username, email, password, first_name=None, last_name=None, bio=None,country=None ):
+    
+    def __init__(self, username, email, password=None, first_name=None, last_name=None, bio=None,country=None, password_hash=None ):
         """Initialize a new user.
 
         
         Args:
             username (str): The username
             email (str): The email address
-            password (str): The unhashed password
+            password (str, optional): The unhashed password
             first_name (str, optional): The user's first name
             last_name (str, optional): The user's last name
+            password_hash (str, optional): An already computed hash, used instead of ``password``
         """
         self.username = username
         self.email = email
-        self.password = password  # This will call the password.setter
+        if password_hash is not None:
+            self.password_hash = password_hash
+        else:
+            self.password = password  # This will call the password.setter
         self.first_name = first_name
         self.last_name = last_name
         self.bio = bio
@@ -67,20 +77,14 @@ class User(db.Model):
     
     def to_dict(self):
         """Convert user object to dictionary.
+
+        The output is the same as ``UserSchema().dump(user)``.
         
         Returns:
             dict: User details
         """
-        return {
-            'id': self.id,
-            'username': self.username,
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'is_active': self.is_active
-        }
+        from app.schemas.user_schema import user_serializer
+        return user_serializer.dump(self)
     
     def __repr__(self):
         """Return string representation of the user.
@@ -1,10 +1,14 @@
 """User routes for the application."""
 from flask import Blueprint
 from app.controllers.user_controller import UserController
+from app.utils.rate_limit import enforce_rate_limits
 
 # Create blueprint
 user_bp = Blueprint('user', __name__, url_prefix='/api/users')
 
+# Per-route limits are configured in RATE_LIMITS by endpoint name
+user_bp.before_request(enforce_rate_limits)
+
 # User registration and authentication
 user_bp.add_url_rule(
     '',
@@ -12,6 +16,12 @@ user_bp.add_url_rule(
     methods=['POST']
 )
 
+user_bp.add_url_rule(
+    '/bulk',
+    view_func=UserController.bulk_create_users,
+    methods=['POST']
+)
+
 user_bp.add_url_rule(
     '/login',
     view_func=UserController.login,
@@ -27,6 +37,30 @@ user_bp.add_url_rule(
     methods=['GET']
 )
 
+user_bp.add_url_rule(
+    '/search',
+    view_func=UserController.search_users,
+    methods=['GET']
+)
+
+user_bp.add_url_rule(
+    '/availability',
+    view_func=UserController.check_availability,
+    methods=['GET']
+)
+
+user_bp.add_url_rule(
+    '/export',
+    view_func=UserController.export_users,
+    methods=['GET']
+)
+
+user_bp.add_url_rule(
+    '/cache/stats',
+    view_func=UserController.cache_stats,
+    methods=['GET']
+)
+
 user_bp.add_url_rule(
     '/<int:user_id>',
     view_func=UserController.get_user,
@@ -45,8 +79,20 @@ user_bp.add_url_rule(
     methods=['DELETE']
 ) 
 
+user_bp.add_url_rule(
+    '/deactivate',
+    view_func=UserController.deactivate_users,
+    methods=['POST']
+)
+
 user_bp.add_url_rule(
     '/report',
     view_func=UserController.report_user,
     methods=['POST']
-) 
\ No newline at end of file
+)
+
+user_bp.add_url_rule(
+    '/reports/top',
+    view_func=UserController.get_most_reported_users,
+    methods=['GET']
+)
@@ -1,6 +1,15 @@
 """User schema for serialization and validation."""
 from marshmallow import Schema, fields, validate, validates, ValidationError
-import re
+import string
+from app.schemas.fast_serializer import CompiledSerializer
+
+# Character classes a password must draw from, in the order they are reported
+_PASSWORD_CLASSES = (
+    (frozenset(string.ascii_uppercase), 'Password must contain at least one uppercase letter'),
+    (frozenset(string.ascii_lowercase), 'Password must contain at least one lowercase letter'),
+    (frozenset(string.digits), 'Password must contain at least one number'),
+    (frozenset('!@#$%^&*(),.?":{}|<>'), 'Password must contain at least one special character'),
+)
 
 class UserSchema(Schema):
     """Schema for User model."""
@@ -29,6 +38,7 @@ class UserSchema(Schema):
     is_active = fields.Bool(dump_only=True)
     bio = fields.Str(validate=validate.Length(max=256))
     country = fields.Str(validate = validate.Length(max=50))
+    version = fields.Int(dump_only=True)
     
     @validates('password')
     def validate_password(self, value):
@@ -40,16 +50,18 @@ class UserSchema(Schema):
         Raises:
             ValidationError: If password doesn't meet complexity requirements
         """
-        if not re.search(r'[A-Z]', value):
-            raise ValidationError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', value):
-            raise ValidationError('Password must contain at least one lowercase letter')
-        if not re.search(r'[0-9]', value):
-            raise ValidationError('Password must contain at least one number')
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', value):
-            raise ValidationError('Password must contain at least one special character')
+        # A single pass builds the character set; each class is then a set check
+        chars = set(value)
+        for char_class, message in _PASSWORD_CLASSES:
+            if chars.isdisjoint(char_class):
+                raise ValidationError(message)
 
 
 # Create schema instances
 user_schema = UserSchema()
-users_schema = UserSchema(many=True) 
\ No newline at end of file
+users_schema = UserSchema(many=True)
+
+# Precompiled equivalents of user_schema.dump / users_schema.dump for hot read paths
+user_serializer = CompiledSerializer(user_schema)
+users_serializer = CompiledSerializer(users_schema)
+ 
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""Request validation with schemas built once per configuration."""
+from functools import lru_cache
+from typing import Type
+from marshmallow import Schema
+
+
+@lru_cache(maxsize=None)
+def get_schema(schema_cls: Type[Schema], **options) -> Schema:
+    """Return a shared schema instance for a class and its options.
+
+    Building a marshmallow schema copies and binds every declared field
+    and compiles its validators, which costs several times more than the
+    ``load`` itself. Schemas hold no per-call state, so one instance per
+    configuration can serve every request.
+
+    Args:
+        schema_cls (type): Schema class
+        **options: Schema constructor options such as ``partial`` or ``many``
+
+    Returns:
+        Schema: Cached schema instance
+    """
+    return schema_cls(**options)
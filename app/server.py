@@ -0,0 +1,37 @@
+"""Pre-forking production server."""
+from flask import Flask
+from gunicorn.app.base import Application
+
+CONFIG = 'python:config.gunicorn'
+
+
+class ProductionServer(Application):
+    """Gunicorn application serving an already created Flask app.
+
+    Settings come from :mod:`config.gunicorn` only; command-line
+    arguments are left to the caller.
+    """
+
+    def __init__(self, flask_app: Flask):
+        """Initialize the server.
+
+        Args:
+            flask_app (Flask): Application to serve
+        """
+        self.flask_app = flask_app
+        super().__init__()
+
+    def load_config(self):
+        self.load_config_from_module_name_or_filename(CONFIG)
+
+    def load(self) -> Flask:
+        return self.flask_app
+
+
+def serve(flask_app: Flask) -> None:
+    """Serve an app with gunicorn until the master process is stopped.
+
+    Args:
+        flask_app (Flask): Application to serve
+    """
+    ProductionServer(flask_app).run()
@@ -0,0 +1,139 @@
+"""Async variant of the user service for the ASGI serving mode."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select
+from app.models.report import Report
+from app.models.user import User
+from app.schemas.user_schema import user_serializer, users_serializer
+from app.services.report_counts import report_count_rows, report_count_upsert
+from app.services.user_cache import get_user_cache, get_user_list_cache
+from app.services.user_service import UserService, split_users_page, users_page_stmt
+from config.async_database import get_async_db
+
+
+class AsyncUserService:
+    """Async counterparts of the read and report operations of UserService.
+
+    Results are identical to the sync service and share its user and
+    list caches.
+    """
+
+    @staticmethod
+    async def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
+        """Get user by ID.
+
+        Args:
+            user_id (int): User ID
+
+        Returns:
+            dict: User data if found, None otherwise
+        """
+        cache = get_user_cache()
+        cached = cache.get_by_id(user_id)
+        if cached is not None:
+            return cached
+
+        # Read before querying: a write racing with the query bumps past it
+        generation = cache.generation.value()
+        async with get_async_db().session() as session:
+            user = await session.scalar(select(User).where(User.id == user_id, User.is_active.is_(True)))
+            if not user:
+                return None
+            data = user_serializer.dump(user)
+        cache.put(generation, data)
+        return data
+
+    @staticmethod
+    async def get_user_version(user_id: int) -> Optional[int]:
+        """Get the current version of a user.
+
+        Args:
+            user_id (int): User ID
+
+        Returns:
+            int: User version if found, None otherwise
+        """
+        cached = get_user_cache().get_by_id(user_id)
+        if cached is not None:
+            return cached["version"]
+        async with get_async_db().session() as session:
+            return await session.scalar(select(User.version).where(User.id == user_id, User.is_active.is_(True)))
+
+    @staticmethod
+    async def get_all_users(limit: int, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of users ordered by ID.
+
+        Args:
+            limit (int): Maximum number of users to return
+            after (dict, optional): Decoded cursor of the previous page
+
+        Returns:
+            tuple: List of users and the cursor of the next page (None on the last page)
+
+        Raises:
+            ValueError: If the cursor does not describe a user position
+        """
+        stmt = users_page_stmt(select(User), limit, after)
+        async with get_async_db().session() as session:
+            users = (await session.scalars(stmt)).all()
+        users, next_cursor = split_users_page(users, limit)
+        return users_serializer.dump(users), next_cursor
+
+    @staticmethod
+    async def get_users_page(limit: int, after: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], str]:
+        """Render a page of users and store it in the list cache.
+
+        Args:
+            limit (int): Maximum number of users to return
+            after (dict, optional): Decoded cursor of the previous page
+
+        Returns:
+            tuple: Response data and ETag of the page
+
+        Raises:
+            ValueError: If the cursor does not describe a user position
+        """
+        # Read before querying: a write racing with the query bumps past it
+        generation = get_user_list_cache().generation.value()
+        users, next_cursor = await AsyncUserService.get_all_users(limit, after)
+        return UserService.cache_users_page(generation, limit, after, users, next_cursor)
+
+    @staticmethod
+    async def get_user_versions_page(limit: int, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Tuple[int, int]], Optional[str]]:
+        """Get the IDs and versions of the users on a page.
+
+        Args:
+            limit (int): Maximum number of users to return
+            after (dict, optional): Decoded cursor of the previous page
+
+        Returns:
+            tuple: List of ``(id, version)`` and the cursor of the next page
+
+        Raises:
+            ValueError: If the cursor does not describe a user position
+        """
+        stmt = users_page_stmt(select(User.id, User.version), limit, after)
+        async with get_async_db().session() as session:
+            rows = (await session.execute(stmt)).all()
+        rows, next_cursor = split_users_page(rows, limit)
+        return [(row.id, row.version) for row in rows], next_cursor
+
+    @staticmethod
+    async def report_user(validated_data: Dict[str, Any]) -> None:
+        """Store a report and update the per-day counters in one transaction.
+
+        Args:
+            validated_data (dict): Validated report request data
+        """
+        report = Report(user_id=validated_data.get("target_id"), reason=validated_data["reason"])
+        report.created_at = datetime.utcnow()
+
+        async with get_async_db().session() as session:
+            async with session.begin():
+                session.add(report)
+                await session.flush()
+                rows = report_count_rows([(report.user_id, report.created_at)])
+                stmt = report_count_upsert(rows, session.bind.dialect.name)
+                if stmt is None:
+                    raise RuntimeError("Report counters need a database with upsert support")
+                await session.execute(stmt)
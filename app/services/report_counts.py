@@ -0,0 +1,79 @@
+"""Maintenance of the per-day report counter table."""
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql import Executable
+from app.models.report import ReportCount
+from config.database import db
+
+_UPSERT_DIALECTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def report_count_rows(reports: Iterable[Tuple[int, datetime]]) -> List[Dict[str, Any]]:
+    """Aggregate new reports into per-user, per-day increments.
+
+    Args:
+        reports (iterable): ``(user_id, created_at)`` of each new report
+
+    Returns:
+        list: Counter increments sorted by key
+    """
+    counts = Counter((user_id, created_at.date()) for user_id, created_at in reports)
+    # A fixed key order keeps concurrent writers from deadlocking on row locks
+    return [
+        {'user_id': user_id, 'day': day, 'count': count}
+        for (user_id, day), count in sorted(counts.items())
+    ]
+
+
+def report_count_upsert(rows: List[Dict[str, Any]], dialect_name: str) -> Optional[Executable]:
+    """Build a single INSERT ... ON CONFLICT statement adding the increments.
+
+    Args:
+        rows (list): Increments from :func:`report_count_rows`
+        dialect_name (str): Name of the database dialect
+
+    Returns:
+        Executable: Upsert statement, or None if the dialect has no upsert support
+    """
+    dialect_insert = _UPSERT_DIALECTS.get(dialect_name)
+    if dialect_insert is None:
+        return None
+    stmt = dialect_insert(ReportCount).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[ReportCount.user_id, ReportCount.day],
+        set_={'count': ReportCount.count + stmt.excluded['count']}
+    )
+
+
+def increment_report_counts(reports: Iterable[Tuple[int, datetime]]) -> None:
+    """Add reports to the per-day counters in the current transaction.
+
+    The caller commits, so counters and reports become visible together.
+
+    Args:
+        reports (iterable): ``(user_id, created_at)`` of each new report
+    """
+    rows = report_count_rows(reports)
+    if not rows:
+        return
+
+    stmt = report_count_upsert(rows, db.session.get_bind().dialect.name)
+    if stmt is not None:
+        db.session.execute(stmt)
+        return
+
+    for row in rows:
+        result = db.session.execute(
+            update(ReportCount)
+            .where(ReportCount.user_id == row['user_id'], ReportCount.day == row['day'])
+            .values(count=ReportCount.count + row['count'])
+        )
+        if result.rowcount == 0:
+            db.session.add(ReportCount(**row))
+    db.session.flush()
@@ -0,0 +1,232 @@
+"""Write-behind ingestion queue for user reports."""
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from flask import Flask, current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from app.models.report import Report
+from app.services.report_counts import increment_report_counts
+from config.database import db
+
+logger = logging.getLogger(__name__)
+
+
+class ReportQueueFullError(Exception):
+    """Raised when the ingestion queue cannot accept more reports."""
+
+
+class ReportQueue:
+    """Coalesce reports in memory and insert them in multi-row batches.
+
+    A background thread flushes whenever ``batch_size`` reports are
+    pending or the oldest pending report has waited ``flush_interval``
+    seconds, whichever comes first. If the database fails, the batch
+    goes back to the head of the queue and is retried with exponential
+    backoff; only reports the database rejects are dropped. Reports
+    still queued when the process exits are flushed by an ``atexit``
+    hook; a hard crash loses them, which is the trade-off of the async
+    durability mode.
+    """
+
+    def __init__(self, app: Flask, batch_size: int, flush_interval: float, max_pending: int,
+                 retry_delay: float = 0.5, max_retry_delay: float = 30.0):
+        """Initialize the queue.
+
+        Args:
+            app (Flask): Application providing the database configuration
+            batch_size (int): Maximum number of reports per INSERT
+            flush_interval (float): Maximum seconds a report waits before being flushed
+            max_pending (int): Maximum number of queued reports
+            retry_delay (float, optional): Seconds before the first retry of a failed batch
+            max_retry_delay (float, optional): Cap of the doubling retry delay
+        """
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        # (time queued, row) pairs, oldest first
+        self._pending: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._failures = 0
+        self._retry_at = 0.0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._atexit_registered = False
+
+    @classmethod
+    def from_config(cls, app: Flask) -> 'ReportQueue':
+        """Build a report queue from the application's configuration."""
+        return cls(
+            app,
+            batch_size=app.config['REPORT_BATCH_SIZE'],
+            flush_interval=app.config['REPORT_FLUSH_INTERVAL'],
+            max_pending=app.config['REPORT_QUEUE_MAX_PENDING'],
+            retry_delay=app.config['REPORT_RETRY_DELAY'],
+            max_retry_delay=app.config['REPORT_RETRY_MAX_DELAY']
+        )
+
+    def _ensure_worker(self) -> None:
+        # Started on first use, so each pre-forked worker runs its own thread.
+        # Must be called with the condition held.
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='report-queue', daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.shutdown)
+                self._atexit_registered = True
+
+    def submit(self, row: Dict[str, Any]) -> None:
+        """Queue a report row for insertion.
+
+        Args:
+            row (dict): Column values of the report
+
+        Raises:
+            ReportQueueFullError: If ``max_pending`` reports are already queued
+        """
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                raise ReportQueueFullError('Report queue is full')
+            self._ensure_worker()
+            self._pending.append((time.monotonic(), row))
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def pending(self) -> int:
+        """Return the number of queued reports."""
+        with self._cond:
+            return len(self._pending)
+
+    def _take(self, limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+        # Must be called with the condition held
+        count = min(limit, len(self._pending))
+        return [self._pending.popleft() for _ in range(count)]
+
+    def _requeue(self, entries: List[Tuple[float, Dict[str, Any]]]) -> None:
+        # Must be called with the condition held. Failed rows go back ahead
+        # of newer ones with their original queue times.
+        self._pending.extendleft(reversed(entries))
+        self._failures += 1
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** (self._failures - 1))
+        self._retry_at = time.monotonic() + delay
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    now = time.monotonic()
+                    if not self._pending:
+                        self._cond.wait()
+                    elif now < self._retry_at:
+                        self._cond.wait(self._retry_at - now)
+                    else:
+                        waited = now - self._pending[0][0]
+                        if len(self._pending) >= self.batch_size or waited >= self.flush_interval:
+                            break
+                        self._cond.wait(self.flush_interval - waited)
+                if self._stopping:
+                    return
+                entries = self._take(self.batch_size)
+            try:
+                self._write(entries)
+            except Exception:
+                # Keep the thread alive; the batch is retried after a backoff
+                with self._cond:
+                    self._requeue(entries)
+                    retry_in = self._retry_at - time.monotonic()
+                logger.warning("Report batch of %d failed, retrying in %.1fs", len(entries), retry_in, exc_info=True)
+
+    def _write(self, entries: List[Tuple[float, Dict[str, Any]]]) -> None:
+        with self.app.app_context():
+            try:
+                write_reports([row for _, row in entries])
+            finally:
+                db.session.remove()
+        with self._cond:
+            self._failures = 0
+            self._retry_at = 0.0
+
+    def flush(self) -> int:
+        """Insert every queued report on the calling thread.
+
+        Returns:
+            int: Number of reports written
+
+        Raises:
+            SQLAlchemyError: If the database fails; unwritten reports stay queued
+        """
+        with self._cond:
+            entries = self._take(len(self._pending))
+        for start in range(0, len(entries), self.batch_size):
+            try:
+                self._write(entries[start:start + self.batch_size])
+            except Exception:
+                with self._cond:
+                    self._requeue(entries[start:])
+                raise
+        return len(entries)
+
+    def shutdown(self, timeout: float = 10) -> None:
+        """Stop the worker thread and flush everything still queued.
+
+        Args:
+            timeout (float): Seconds to wait for an in-progress batch
+        """
+        with self._cond:
+            self._stopping = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        try:
+            self.flush()
+        except Exception:
+            logger.error("Lost %d queued reports at shutdown", self.pending(), exc_info=True)
+
+
+def write_reports(rows: List[Dict[str, Any]]) -> None:
+    """Insert report rows in one multi-row INSERT and commit.
+
+    The per-day report counters are updated in the same transaction. If
+    the database rejects the batch, for example because one report
+    targets a user that no longer exists, the rows are retried one by
+    one under savepoints and only the rejected rows are dropped. Other
+    database errors propagate so the caller can retry the whole batch.
+
+    Args:
+        rows (list): Column values of the reports, including ``created_at``
+
+    Raises:
+        SQLAlchemyError: If the database fails for a reason other than a
+            constraint violation
+    """
+    try:
+        db.session.execute(insert(Report), rows)
+        increment_report_counts((row['user_id'], row['created_at']) for row in rows)
+        db.session.commit()
+        return
+    except IntegrityError:
+        db.session.rollback()
+
+    written = []
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(Report), [row])
+            written.append(row)
+        except IntegrityError:
+            logger.warning("Dropped report for user %s", row.get('user_id'), exc_info=True)
+    increment_report_counts((row['user_id'], row['created_at']) for row in written)
+    db.session.commit()
+
+
+def get_report_queue() -> ReportQueue:
+    """Return the report queue of the current application."""
+    return current_app.extensions['report_queue']
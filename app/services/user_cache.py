@@ -0,0 +1,127 @@
+"""Read-through caches of serialized users."""
+from typing import Any, Dict, Hashable, Optional
+from flask import current_app
+from app.utils.cache import LRUTTLCache
+from app.utils.generation import GenerationCounter
+
+
+class UserCache:
+    """Cache serialized user dicts by ID and by username.
+
+    Keys are stamped with the users generation, like the pages of
+    :class:`UserListCache`, so any user write makes every cached user
+    unreachable; with a shared generation file that includes the writes
+    of other workers. Without one, the TTL bounds how stale other
+    workers can be.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, generation: GenerationCounter):
+        """Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of cache entries
+            ttl (float): Seconds a cached user stays valid
+            generation (GenerationCounter): Users generation stamping the keys
+        """
+        self._cache = LRUTTLCache(maxsize, ttl)
+        self.generation = generation
+
+    @classmethod
+    def from_config(cls, config, generation: GenerationCounter) -> 'UserCache':
+        """Build a user cache from Flask configuration."""
+        return cls(config['USER_CACHE_SIZE'], config['USER_CACHE_TTL'], generation)
+
+    def get_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Return the cached user with the given ID."""
+        return self._cache.get((self.generation.value(), 'id', user_id))
+
+    def get_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        """Return the cached user with the given username."""
+        return self._cache.get((self.generation.value(), 'username', username))
+
+    def put(self, generation: int, user: Dict[str, Any]) -> None:
+        """Cache a serialized user under its ID and username.
+
+        Args:
+            generation (int): Generation read before the user was queried; a
+                row read during a concurrent write is thus never served
+            user (dict): Serialized user data
+        """
+        self._cache.set((generation, 'id', user['id']), user)
+        self._cache.set((generation, 'username', user['username']), user)
+
+    def clear(self) -> None:
+        """Drop every cached user of this worker."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counters."""
+        return self._cache.stats()
+
+
+class UserListCache:
+    """Cache rendered pages of the user list.
+
+    Keys are stamped with a users generation that every user write
+    bumps, so invalidation is a single increment: entries of older
+    generations are never looked up again and age out of the LRU. With a
+    shared generation file, a write in one worker invalidates the pages
+    cached by all of them.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, generation: GenerationCounter):
+        """Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of cached pages
+            ttl (float): Seconds a cached page stays valid
+            generation (GenerationCounter): Users generation stamping the keys
+        """
+        self._cache = LRUTTLCache(maxsize, ttl)
+        self.generation = generation
+
+    @classmethod
+    def from_config(cls, config) -> 'UserListCache':
+        """Build a user list cache from Flask configuration."""
+        return cls(
+            config['USERS_LIST_CACHE_SIZE'],
+            config['USERS_LIST_CACHE_TTL'],
+            GenerationCounter(config['USERS_GENERATION_FILE'] or None)
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the page cached under a key in the current generation."""
+        return self._cache.get((self.generation.value(), key))
+
+    def put(self, generation: int, key: Hashable, page: Any) -> None:
+        """Cache a page.
+
+        Args:
+            generation (int): Generation read before the page was queried; a
+                page built during a concurrent write is thus never served
+            key: Page parameters
+            page: Rendered page
+        """
+        self._cache.set((generation, key), page)
+
+    def invalidate(self) -> None:
+        """Drop every cached page by starting a new generation."""
+        self.generation.bump()
+
+    def clear(self) -> None:
+        """Drop every cached page of this worker."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counters."""
+        return self._cache.stats()
+
+
+def get_user_cache() -> UserCache:
+    """Return the user cache of the current application."""
+    return current_app.extensions['user_cache']
+
+
+def get_user_list_cache() -> UserListCache:
+    """Return the user list cache of the current application."""
+    return current_app.extensions['user_list_cache']
@@ -0,0 +1,172 @@
+"""Bloom filter of taken usernames and emails."""
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+from flask import current_app
+from sqlalchemy import func, select
+from app.models.user import User
+from app.utils.bloom import BloomFilter
+from app.utils.generation import GenerationCounter
+from config.database import db
+
+
+def _key(field: str, value: str) -> str:
+    return f'{field}:{value}'
+
+
+class UserNameFilter:
+    """Per-worker Bloom filter over the ``username`` and ``email`` columns.
+
+    A miss means no row, active or deactivated, held the name as of the
+    filter's last sync, so signups and availability checks skip the
+    database; a hit must be confirmed with an indexed lookup. The filter
+    is built from the table on first use and this worker's writes are
+    added as they commit. Rows with a higher ID, i.e. other workers'
+    signups, are pulled in when the users generation moves (with a
+    generation file shared between workers) and at least every
+    ``sync_seconds``. Renames by other workers are only picked up by a
+    full rebuild, which runs when the filter saturates and, if
+    ``rebuild_seconds`` is set, periodically; the unique constraints
+    remain the final guard against duplicates.
+
+    Builds run without holding the lock: meanwhile other callers keep
+    using the previous filter, or go to the database before the first
+    build completes.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, generation: GenerationCounter,
+                 sync_seconds: float = 5, rebuild_seconds: float = 0,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the filter.
+
+        Args:
+            capacity (int): Minimum number of users the filter is sized for
+            error_rate (float): False positive rate at full capacity
+            generation (GenerationCounter): Users generation bumped by every write
+            sync_seconds (float): Longest time before new rows are pulled in
+            rebuild_seconds (float): Time between periodic full rebuilds, 0 to disable them
+            clock (callable, optional): Monotonic time source
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.generation = generation
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._clock = clock
+        self._bloom: Optional[BloomFilter] = None
+        self._seen_generation = None
+        self._built_at = self._synced_at = 0.0
+        self._max_id = 0
+        self._building = False
+        # Names committed while a build runs, replayed into the new filter
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, generation: GenerationCounter) -> 'UserNameFilter':
+        """Build a name filter from Flask configuration."""
+        return cls(
+            config['USER_NAME_FILTER_CAPACITY'],
+            config['USER_NAME_FILTER_ERROR_RATE'],
+            generation,
+            config['USER_NAME_FILTER_SYNC_SECONDS'],
+            config['USER_NAME_FILTER_REBUILD_SECONDS']
+        )
+
+    def invalidate(self) -> None:
+        """Rebuild the filter from the database on next use."""
+        with self._lock:
+            self._bloom = None
+
+    @staticmethod
+    def _add_rows(bloom: BloomFilter, rows: Iterable, max_id: int) -> int:
+        for row in rows:
+            bloom.add(_key('username', row.username))
+            bloom.add(_key('email', row.email))
+            max_id = max(max_id, row.id)
+        return max_id
+
+    def _needs_rebuild(self, now: float) -> bool:
+        return (self._bloom is None or self._bloom.saturated
+                or (self.rebuild_seconds > 0 and now - self._built_at >= self.rebuild_seconds))
+
+    def _sync(self, now: float) -> None:
+        # Read before querying: a write racing with the query bumps past it
+        generation = self.generation.value()
+        if generation != self._seen_generation or now - self._synced_at >= self.sync_seconds:
+            self._max_id = self._add_rows(self._bloom, db.session.execute(
+                select(User.id, User.username, User.email).where(User.id > self._max_id)
+            ), self._max_id)
+            self._synced_at = now
+        self._seen_generation = generation
+
+    def _build(self, now: float) -> BloomFilter:
+        generation = self.generation.value()
+        try:
+            # Leave room for the table to double before the next rebuild
+            users = db.session.scalar(select(func.count(User.id))) or 0
+            bloom = BloomFilter(2 * max(self.capacity, 2 * users), self.error_rate)
+            max_id = self._add_rows(bloom, db.session.execute(
+                select(User.id, User.username, User.email).execution_options(yield_per=10000)
+            ), 0)
+        except BaseException:
+            with self._lock:
+                self._building = False
+                self._pending.clear()
+            raise
+        with self._lock:
+            for key in self._pending:
+                bloom.add(key)
+            self._pending.clear()
+            self._bloom = bloom
+            self._max_id = max_id
+            self._built_at = self._synced_at = now
+            self._seen_generation = generation
+            self._building = False
+        return bloom
+
+    def might_exist(self, field: str, value: str) -> bool:
+        """Check whether a username or email may already be taken.
+
+        Args:
+            field (str): ``'username'`` or ``'email'``
+            value (str): Name to check
+
+        Returns:
+            bool: False if the name is certainly free, True if it may be taken
+        """
+        with self._lock:
+            now = self._clock()
+            build = not self._building and self._needs_rebuild(now)
+            if build:
+                self._building = True
+            elif self._bloom is not None:
+                self._sync(now)
+            bloom = self._bloom
+        if build:
+            bloom = self._build(now)
+        # Only while another caller runs the first build
+        if bloom is None:
+            return True
+        return _key(field, value) in bloom
+
+    def add(self, username: Optional[str] = None, email: Optional[str] = None) -> None:
+        """Record the names of a committed user.
+
+        Args:
+            username (str, optional): Username
+            email (str, optional): Email address
+        """
+        with self._lock:
+            for field, value in (('username', username), ('email', email)):
+                if value is None:
+                    continue
+                if self._building:
+                    self._pending.append(_key(field, value))
+                if self._bloom is not None:
+                    self._bloom.add(_key(field, value))
+
+
+def get_user_name_filter() -> UserNameFilter:
+    """Return the username/email filter of the current application."""
+    return current_app.extensions['user_name_filter']
@@ -0,0 +1,47 @@
+"""Hard deletion of deactivated users."""
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+from app.models.report import Report, ReportCount
+from app.models.user import User
+from config.database import db
+
+logger = logging.getLogger(__name__)
+
+
+def purge_deactivated_users(grace_days: float, batch_size: int) -> int:
+    """Delete users deactivated more than ``grace_days`` ago, with their reports.
+
+    Works in batches of ``batch_size`` users, each in its own short
+    transaction, so no lock is held for long and a purge interrupted
+    half-way loses nothing but time.
+
+    Args:
+        grace_days (float): Days a deactivated user is kept before purging
+        batch_size (int): Maximum number of users deleted per transaction
+
+    Returns:
+        int: Number of users deleted
+    """
+    cutoff = datetime.utcnow() - timedelta(days=grace_days)
+    purged = 0
+    while True:
+        user_ids = db.session.scalars(
+            select(User.id)
+            .where(User.is_active.is_(False), User.updated_at < cutoff)
+            .order_by(User.id)
+            .limit(batch_size)
+        ).all()
+        if not user_ids:
+            return purged
+
+        # Children first; reports reference users.id
+        for stmt in (
+            delete(Report).where(Report.user_id.in_(user_ids)),
+            delete(ReportCount).where(ReportCount.user_id.in_(user_ids)),
+            delete(User).where(User.id.in_(user_ids)),
+        ):
+            db.session.execute(stmt.execution_options(synchronize_session=False))
+        db.session.commit()
+        purged += len(user_ids)
+        logger.info("Purged %d deactivated users", len(user_ids))
@@ -0,0 +1,180 @@
+"""User search backends.
+
+PostgreSQL searches with ``pg_trgm``: trigram GIN indexes on username,
+first and last name serve both fuzzy (``%``) and prefix (``ILIKE 'q%'``)
+matches. Other databases, i.e. the SQLite test backend, use an
+in-memory prefix index that is rebuilt after user writes.
+"""
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from flask import current_app
+from sqlalchemy import case, func, literal, or_, select
+from app.models.user import User
+from app.utils.generation import GenerationCounter
+from config.database import db
+
+# Score added to prefix matches so autocomplete hits rank above fuzzy ones
+PREFIX_BOOST = 1.0
+
+_SEARCH_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def _escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _keyset_page(rows: List[Tuple[float, Any]], limit: int) -> Tuple[List[Tuple[float, Any]], Optional[Dict[str, Any]]]:
+    """Split ``limit + 1`` ranked rows into a page and the next position."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    score, user = rows[-1]
+    return rows, {'s': score, 'id': user.id}
+
+
+def search_trigram(query: str, limit: int, after: Optional[Dict[str, Any]]):
+    """Search users with pg_trgm similarity and prefix matching.
+
+    Args:
+        query (str): Search text
+        limit (int): Maximum number of users to return
+        after (dict, optional): ``{'s': score, 'id': id}`` of the last user on the previous page
+
+    Returns:
+        tuple: List of ``(score, user)`` and the next position (None on the last page)
+    """
+    prefix = _escape_like(query) + '%'
+    # The trigram GIN indexes are on the bare columns; NULLs never match
+    # anyway, so only the score needs coalesce
+    columns = [User.username, User.first_name, User.last_name]
+    score = (
+        func.greatest(*(func.similarity(func.coalesce(column, ''), query) for column in columns))
+        + case((User.username.ilike(prefix, escape='\\'), literal(PREFIX_BOOST)), else_=literal(0.0))
+    ).label('score')
+
+    stmt = (
+        select(score, User)
+        .where(or_(*(column.op('%')(query) for column in columns),
+                   *(column.ilike(prefix, escape='\\') for column in columns)))
+        .where(User.is_active.is_(True))
+        .order_by(score.desc(), User.id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(or_(score < after['s'], (score == after['s']) & (User.id > after['id'])))
+
+    rows = [(float(row.score), row.User) for row in db.session.execute(stmt)]
+    return _keyset_page(rows, limit)
+
+
+class PrefixIndex:
+    """Sorted in-memory index of lower-cased name tokens.
+
+    Prefix lookups are two binary searches, so autocomplete latency
+    stays flat as the table grows. The index is rebuilt from the
+    database on the first search after the users generation moves, so
+    with a generation file shared between workers it follows the
+    writes of all of them.
+    """
+
+    def __init__(self, generation: GenerationCounter):
+        """Initialize the index.
+
+        Args:
+            generation (GenerationCounter): Users generation bumped by every write
+        """
+        self.generation = generation
+        self._entries: List[Tuple[str, int, int]] = []
+        self._built_generation: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Rebuild the index from the database on next use."""
+        with self._lock:
+            self._built_generation = None
+
+    def _rebuild(self) -> None:
+        entries = []
+        rows = db.session.execute(
+            select(User.id, User.username, User.first_name, User.last_name).where(User.is_active.is_(True))
+        )
+        for row in rows:
+            for rank, field in enumerate(_SEARCH_FIELDS):
+                value = getattr(row, field)
+                if value:
+                    entries.append((value.lower(), rank, row.id))
+        entries.sort()
+        self._entries = entries
+
+    def lookup(self, prefix: str) -> Dict[int, float]:
+        """Score every user with a token starting with ``prefix``.
+
+        Args:
+            prefix (str): Search text
+
+        Returns:
+            dict: User ID to score; higher is better
+        """
+        with self._lock:
+            # Read before querying: a write racing with the rebuild bumps past it
+            generation = self.generation.value()
+            if generation != self._built_generation:
+                self._rebuild()
+                # Only after a successful rebuild, so a failed one is retried
+                self._built_generation = generation
+            entries = self._entries
+
+        prefix = prefix.lower()
+        start = bisect.bisect_left(entries, (prefix,))
+        end = bisect.bisect_left(entries, (prefix + '\uffff',))
+        scores: Dict[int, float] = {}
+        for token, rank, user_id in entries[start:end]:
+            # Exact username, then username prefix, then first/last name prefix
+            if rank == 0:
+                score = 3.0 if token == prefix else 2.0
+            else:
+                score = 1.0
+            if score > scores.get(user_id, 0.0):
+                scores[user_id] = score
+        return scores
+
+
+def search_prefix_index(query: str, limit: int, after: Optional[Dict[str, Any]]):
+    """Search users through the in-memory prefix index.
+
+    Args:
+        query (str): Search text
+        limit (int): Maximum number of users to return
+        after (dict, optional): ``{'s': score, 'id': id}`` of the last user on the previous page
+
+    Returns:
+        tuple: List of ``(score, user)`` and the next position (None on the last page)
+    """
+    scores = get_search_index().lookup(query)
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    if after is not None:
+        ranked = [(user_id, score) for user_id, score in ranked
+                  if score < after['s'] or (score == after['s'] and user_id > after['id'])]
+    ranked = ranked[:limit + 1]
+
+    users = {user.id: user for user in User.query.filter(User.id.in_([user_id for user_id, _ in ranked]),
+                                                         User.is_active.is_(True))}
+    rows = [(score, users[user_id]) for user_id, score in ranked if user_id in users]
+    return _keyset_page(rows, limit)
+
+
+def get_search_index() -> PrefixIndex:
+    """Return the prefix index of the current application."""
+    return current_app.extensions['user_search_index']
+
+
+def search_users(query: str, limit: int, after: Optional[Dict[str, Any]]):
+    """Search users with the backend matching the database dialect.
+
+    Returns:
+        tuple: List of ``(score, user)`` and the next position (None on the last page)
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return search_trigram(query, limit, after)
+    return search_prefix_index(query, limit, after)
@@ -1,11 +1,104 @@
 """User service for handling business logic."""
 
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from sqlalchemy import func, insert, or_, select, update
 from sqlalchemy.exc import IntegrityError
-from app.models.report import Report
+from app.models.report import Report, ReportCount
 from config.database import db
 from app.models.user import User
-from app.schemas.user_schema import user_schema, users_schema
+from app.schemas.user_schema import user_serializer, users_serializer
+from app.services.report_counts import increment_report_counts
+from app.services.report_queue import get_report_queue
+from app.services.user_cache import get_user_cache, get_user_list_cache
+from app.services.user_names import get_user_name_filter
+from app.services.user_search import search_users
+from app.utils.etag import page_etag
+from app.utils.pagination import encode_cursor
+from app.utils.password_hasher import get_password_hasher
+
+
+def _conflict_result(index: int) -> Dict[str, Any]:
+    """Build the bulk-create result for a duplicate username or email."""
+    return {"index": index, "status": "conflict", "message": "Username or email already exists"}
+
+
+class VersionConflictError(Exception):
+    """Raised when a user changed since the version the client last read."""
+
+
+def _users_changed() -> None:
+    """Refresh derived user state after a committed write.
+
+    Bumps the users generation, which also stales the user caches and
+    the search index.
+    """
+    get_user_list_cache().invalidate()
+
+
+def _cursor_id(after: Dict[str, Any]) -> int:
+    """Return the user ID a cursor points after.
+
+    Raises:
+        ValueError: If the cursor does not describe a user position
+    """
+    after_id = after.get("id")
+    # bool is an int subclass, but true/false are not user IDs
+    if not isinstance(after_id, int) or isinstance(after_id, bool):
+        raise ValueError("Invalid cursor")
+    return after_id
+
+
+def users_page_stmt(stmt, limit: int, after: Optional[Dict[str, Any]]):
+    """Restrict a select to a keyset page of active users ordered by ID.
+
+    One row more than ``limit`` is selected so :func:`split_users_page`
+    can tell whether another page follows.
+
+    Raises:
+        ValueError: If the cursor does not describe a user position
+    """
+    stmt = stmt.where(User.is_active.is_(True)).order_by(User.id)
+    if after is not None:
+        stmt = stmt.where(User.id > _cursor_id(after))
+    return stmt.limit(limit + 1)
+
+
+def split_users_page(rows: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Split the rows of :func:`users_page_stmt` into a page and the next cursor.
+
+    Returns:
+        tuple: Rows of the page and the cursor of the next page (None on the last page)
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor({"id": rows[-1].id})
+    return rows, None
+
+
+def _users_page(stmt, limit: int, after: Optional[Dict[str, Any]], scalars: bool = True):
+    """Run a keyset-paginated select over active users ordered by ID.
+
+    Returns:
+        tuple: Rows of the page and the cursor of the next page (None on the last page)
+
+    Raises:
+        ValueError: If the cursor does not describe a user position
+    """
+    stmt = users_page_stmt(stmt, limit, after)
+    rows = db.session.scalars(stmt).all() if scalars else db.session.execute(stmt).all()
+    return split_users_page(rows, limit)
+
+
+def _page_key(limit: int, after: Optional[Dict[str, Any]]) -> Tuple[int, Optional[int]]:
+    """Build the list cache key of a page.
+
+    Raises:
+        ValueError: If the cursor does not describe a user position
+    """
+    if after is None:
+        return limit, None
+    return limit, _cursor_id(after)
 
 
 class UserService:
@@ -23,12 +116,17 @@ class UserService:
 
         Raises:
             ValueError: If username or email already exists
+            HashingBusyError: If the password hashing queue is full
         """
+        # Duplicates are rejected before paying for a hash
+        if not all(UserService.check_availability(data["username"], data["email"]).values()):
+            raise ValueError("Username or email already exists")
+        password_hash = get_password_hasher().hash(data["password"])
         try:
             user = User(
                 username=data["username"],
                 email=data["email"],
-                password=data["password"],
+                password_hash=password_hash,
                 first_name=data.get("first_name"),
                 last_name=data.get("last_name"),
                 bio=data.get("bio"),
@@ -36,11 +134,145 @@ class UserService:
             )
             db.session.add(user)
             db.session.commit()
-            return user_schema.dump(user)
+            get_user_name_filter().add(data["username"], data["email"])
+            _users_changed()
+            return user_serializer.dump(user)
         except IntegrityError:
             db.session.rollback()
             raise ValueError("Username or email already exists")
 
+    @staticmethod
+    def bulk_create_users(entries: List[Tuple[int, Dict[str, Any]]], batch_size: int = 500) -> List[Dict[str, Any]]:
+        """Create many users with batched multi-row inserts.
+
+        Duplicates, both within the request and against existing rows,
+        are reported per item instead of aborting the whole request.
+
+        Args:
+            entries (list): ``(index, data)`` pairs of already validated user data
+            batch_size (int): Number of rows inserted per statement and transaction
+
+        Returns:
+            list: One result dict per entry, carrying its ``index`` and ``status``
+
+        Raises:
+            HashingBusyError: If the password hashing queue is full
+        """
+        results = {}
+        pending = []
+        seen_usernames, seen_emails = set(), set()
+        for index, data in entries:
+            if data["username"] in seen_usernames or data["email"] in seen_emails:
+                results[index] = _conflict_result(index)
+                continue
+            seen_usernames.add(data["username"])
+            seen_emails.add(data["email"])
+            pending.append((index, data))
+
+        # One indexed lookup per batch instead of one failed INSERT per
+        # duplicate, for the names the filter cannot rule out
+        name_filter = get_user_name_filter()
+        maybe_taken = [
+            data for _, data in pending
+            if name_filter.might_exist("username", data["username"])
+            or name_filter.might_exist("email", data["email"])
+        ]
+        taken_usernames, taken_emails = set(), set()
+        for start in range(0, len(maybe_taken), batch_size):
+            chunk = maybe_taken[start:start + batch_size]
+            rows = db.session.execute(
+                select(User.username, User.email).where(or_(
+                    User.username.in_([data["username"] for data in chunk]),
+                    User.email.in_([data["email"] for data in chunk]),
+                ))
+            ).all()
+            taken_usernames.update(row.username for row in rows)
+            taken_emails.update(row.email for row in rows)
+
+        fresh = []
+        for index, data in pending:
+            if data["username"] in taken_usernames or data["email"] in taken_emails:
+                results[index] = _conflict_result(index)
+            else:
+                fresh.append((index, data))
+
+        hashes = get_password_hasher().hash_many([data["password"] for _, data in fresh])
+
+        rows = [
+            {
+                "username": data["username"],
+                "email": data["email"],
+                "password_hash": password_hash,
+                "first_name": data.get("first_name"),
+                "last_name": data.get("last_name"),
+                "bio": data.get("bio"),
+                "country": data.get("country"),
+            }
+            for (_, data), password_hash in zip(fresh, hashes)
+        ]
+
+        for start in range(0, len(fresh), batch_size):
+            indexes = [index for index, _ in fresh[start:start + batch_size]]
+            chunk = rows[start:start + batch_size]
+            # Serialize before commit so expire-on-commit does not reload every row
+            try:
+                users = db.session.scalars(insert(User).returning(User), chunk).all()
+                dumped = [user_serializer.dump(user) for user in users]
+                db.session.commit()
+            except IntegrityError:
+                # A concurrent writer took a name after our precheck; retry row by row
+                db.session.rollback()
+                dumped = []
+                for row in chunk:
+                    try:
+                        with db.session.begin_nested():
+                            user = db.session.scalars(insert(User).returning(User), [row]).one()
+                        dumped.append(user_serializer.dump(user))
+                    except IntegrityError:
+                        dumped.append(None)
+                db.session.commit()
+
+            for index, user in zip(indexes, dumped):
+                if user is None:
+                    results[index] = _conflict_result(index)
+                else:
+                    name_filter.add(user["username"], user["email"])
+                    results[index] = {"index": index, "status": "created", "user": user}
+
+        if fresh:
+            _users_changed()
+        return [results[index] for index, _ in entries]
+
+    @staticmethod
+    def check_availability(username: Optional[str] = None, email: Optional[str] = None) -> Dict[str, bool]:
+        """Check whether a username and/or email can still be registered.
+
+        Names the Bloom filter has never seen are free without touching
+        the database; possible hits are confirmed with one indexed
+        lookup. Deactivated users keep their names until purged.
+
+        Args:
+            username (str, optional): Username to check
+            email (str, optional): Email address to check
+
+        Returns:
+            dict: ``{field: available}`` for each name given
+        """
+        names = {field: value for field, value in (("username", username), ("email", email)) if value is not None}
+        name_filter = get_user_name_filter()
+        maybe_taken = {field: value for field, value in names.items() if name_filter.might_exist(field, value)}
+
+        taken = set()
+        if maybe_taken:
+            rows = db.session.execute(
+                select(User.username, User.email).where(or_(
+                    *(getattr(User, field) == value for field, value in maybe_taken.items())
+                ))
+            ).all()
+            taken = {field for field, value in maybe_taken.items()
+                     if any(getattr(row, field) == value for row in rows)}
+        return {field: field not in taken for field in names}
+
     @staticmethod
     def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
         """Get user by ID.
@@ -51,8 +283,19 @@ class UserService:
         Returns:
             dict: User data if found, None otherwise
         """
-        user = User.query.get(user_id)
-        return user_schema.dump(user) if user else None
+        cache = get_user_cache()
+        cached = cache.get_by_id(user_id)
+        if cached is not None:
+            return cached
+
+        # Read before querying: a write racing with the query bumps past it
+        generation = cache.generation.value()
+        user = User.query.filter_by(id=user_id, is_active=True).first()
+        if not user:
+            return None
+        data = user_serializer.dump(user)
+        cache.put(generation, data)
+        return data
 
     @staticmethod
     def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
@@ -64,67 +307,293 @@ class UserService:
         Returns:
             dict: User data if found, None otherwise
         """
-        user = User.query.filter_by(username=username).first()
-        return user_schema.dump(user) if user else None
+        cache = get_user_cache()
+        cached = cache.get_by_username(username)
+        if cached is not None:
+            return cached
+
+        # Read before querying: a write racing with the query bumps past it
+        generation = cache.generation.value()
+        user = User.query.filter_by(username=username, is_active=True).first()
+        if not user:
+            return None
+        data = user_serializer.dump(user)
+        cache.put(generation, data)
+        return data
 
     @staticmethod
-    def get_all_users() -> List[Dict[str, Any]]:
-        """Get all users.
+    def get_all_users(limit: int, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of users ordered by ID.
+
+        Uses keyset pagination on the primary key, so the cost of a page
+        does not depend on how deep into the table it is.
+
+        Args:
+            limit (int): Maximum number of users to return
+            after (dict, optional): Decoded cursor of the previous page
 
         Returns:
-            list: List of all users
+            tuple: List of users and the cursor of the next page (None on the last page)
+
+        Raises:
+            ValueError: If the cursor does not describe a user position
         """
-        users = User.query.all()
-        return users_schema.dump(users)
+        users, next_cursor = _users_page(select(User), limit, after)
+        return users_serializer.dump(users), next_cursor
 
     @staticmethod
-    def update_user(user_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def get_cached_users_page(limit: int, after: Optional[Dict[str, Any]] = None) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Get a rendered page of users if the list cache holds it.
+
+        Args:
+            limit (int): Maximum number of users to return
+            after (dict, optional): Decoded cursor of the previous page
+
+        Returns:
+            tuple: Response data and ETag of the page, None on a miss
+
+        Raises:
+            ValueError: If the cursor does not describe a user position
+        """
+        return get_user_list_cache().get(_page_key(limit, after))
+
+    @staticmethod
+    def get_users_page(limit: int, after: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], str]:
+        """Render a page of users and store it in the list cache.
+
+        Args:
+            limit (int): Maximum number of users to return
+            after (dict, optional): Decoded cursor of the previous page
+
+        Returns:
+            tuple: Response data and ETag of the page
+
+        Raises:
+            ValueError: If the cursor does not describe a user position
+        """
+        # Read before querying: a write racing with the query bumps past it
+        generation = get_user_list_cache().generation.value()
+        users, next_cursor = UserService.get_all_users(limit, after)
+        return UserService.cache_users_page(generation, limit, after, users, next_cursor)
+
+    @staticmethod
+    def cache_users_page(generation: int, limit: int, after: Optional[Dict[str, Any]],
+                         users: List[Dict[str, Any]], next_cursor: Optional[str]) -> Tuple[Dict[str, Any], str]:
+        """Render a queried page of users and store it in the list cache.
+
+        Args:
+            generation (int): Users generation read before the page was queried
+            limit (int): Maximum number of users of the page
+            after (dict, optional): Decoded cursor of the previous page
+            users (list): Serialized users of the page
+            next_cursor (str, optional): Cursor of the next page
+
+        Returns:
+            tuple: Response data and ETag of the page
+        """
+        page = (
+            {"users": users, "next_cursor": next_cursor},
+            page_etag(((user["id"], user["version"]) for user in users), next_cursor)
+        )
+        get_user_list_cache().put(generation, _page_key(limit, after), page)
+        return page
+
+    @staticmethod
+    def get_user_versions_page(limit: int, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Tuple[int, int]], Optional[str]]:
+        """Get the IDs and versions of the users on a page.
+
+        Selects the same page as :meth:`get_all_users` without loading
+        or serializing full rows, for conditional requests.
+
+        Args:
+            limit (int): Maximum number of users to return
+            after (dict, optional): Decoded cursor of the previous page
+
+        Returns:
+            tuple: List of ``(id, version)`` and the cursor of the next page
+
+        Raises:
+            ValueError: If the cursor does not describe a user position
+        """
+        rows, next_cursor = _users_page(select(User.id, User.version), limit, after, scalars=False)
+        return [(row.id, row.version) for row in rows], next_cursor
+
+    @staticmethod
+    def get_user_version(user_id: int) -> Optional[int]:
+        """Get the current version of a user.
+
+        Answered from the user cache when possible, otherwise with a
+        single-column SELECT.
+
+        Args:
+            user_id (int): User ID
+
+        Returns:
+            int: User version if found, None otherwise
+        """
+        cached = get_user_cache().get_by_id(user_id)
+        if cached is not None:
+            return cached["version"]
+        return db.session.scalar(select(User.version).where(User.id == user_id, User.is_active.is_(True)))
+
+    @staticmethod
+    def search_users(query: str, limit: int, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Search users by username, first name or last name.
+
+        Results are ranked by relevance, prefix matches first, and paged
+        with a keyset cursor on ``(score, id)``.
+
+        Args:
+            query (str): Search text
+            limit (int): Maximum number of users to return
+            after (dict, optional): Decoded cursor of the previous page
+
+        Returns:
+            tuple: List of users and the cursor of the next page (None on the last page)
+
+        Raises:
+            ValueError: If the cursor does not describe a search position
+        """
+        if after is not None and not (isinstance(after.get("s"), (int, float)) and isinstance(after.get("id"), int)):
+            raise ValueError("Invalid cursor")
+
+        rows, position = search_users(query, limit, after)
+        users = []
+        for score, user in rows:
+            data = user_serializer.dump(user)
+            data["score"] = score
+            users.append(data)
+        return users, encode_cursor(position) if position else None
+
+    @staticmethod
+    def iter_users_for_export(updated_since: Optional[datetime] = None,
+                              batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream every active user ordered by ID.
+
+        Rows are fetched through a server-side cursor in batches of
+        ``batch_size``, so memory use does not grow with the table.
+        An incremental export (``updated_since``) also includes users
+        deactivated since then, with ``is_active`` false, so consumers
+        can drop them.
+
+        Args:
+            updated_since (datetime, optional): Only export users updated at or after this time
+            batch_size (int): Number of rows fetched per round trip
+
+        Yields:
+            dict: Serialized user data
+        """
+        stmt = select(User).order_by(User.id)
+        if updated_since is not None:
+            stmt = stmt.where(User.updated_at >= updated_since)
+        else:
+            stmt = stmt.where(User.is_active.is_(True))
+        stmt = stmt.execution_options(yield_per=batch_size)
+
+        for user in db.session.execute(stmt).scalars():
+            yield user_serializer.dump(user)
+
+    @staticmethod
+    def update_user(user_id: int, data: Dict[str, Any],
+                    expected_version: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """Update user details.
 
+        Issues a single ``UPDATE ... RETURNING`` that also increments the
+        version, so the row is neither loaded beforehand nor reloaded
+        afterwards. With ``expected_version`` the update only applies if
+        nobody else changed the user in the meantime.
+
         Args:
             user_id (int): User ID
             data (dict): Updated user data
+            expected_version (int, optional): Version the client based its changes on
 
         Returns:
             dict: Updated user data if successful, None if user not found
 
         Raises:
             ValueError: If username or email already exists
+            VersionConflictError: If the user's version is not ``expected_version``
+            HashingBusyError: If the password hashing queue is full
         """
-        user = User.query.get(user_id)
-        if not user:
-            return None
+        values = {}
+        for key, value in data.items():
+            if key == "password":
+                values["password_hash"] = get_password_hasher().hash(value)
+            elif key in User.__table__.c:
+                values[key] = value
+        values["version"] = User.version + 1
 
-        try:
-            for key, value in data.items():
-                if key == "password":
-                    user.password = value
-                elif hasattr(user, key):
-                    setattr(user, key, value)
+        stmt = update(User).where(User.id == user_id, User.is_active.is_(True)).values(values).returning(User)
+        if expected_version is not None:
+            stmt = stmt.where(User.version == expected_version)
 
+        try:
+            user = db.session.scalars(stmt).first()
+            if user is None:
+                db.session.rollback()
+                if expected_version is not None and db.session.scalar(
+                        select(User.id).where(User.id == user_id, User.is_active.is_(True))) is not None:
+                    raise VersionConflictError("User was modified by another request")
+                return None
+            # Serialize before commit expires the returned row
+            result = user_serializer.dump(user)
             db.session.commit()
-            return user_schema.dump(user)
         except IntegrityError:
             db.session.rollback()
             raise ValueError("Username or email already exists")
 
+        get_user_name_filter().add(values.get("username"), values.get("email"))
+        _users_changed()
+        return result
+
     @staticmethod
     def delete_user(user_id: int) -> bool:
-        """Delete a user.
+        """Deactivate a user.
+
+        The user is soft-deleted with a single UPDATE and disappears from
+        every read; the row and its reports are removed later by
+        :func:`app.services.user_purge.purge_deactivated_users`.
 
         Args:
             user_id (int): User ID
 
         Returns:
-            bool: True if deleted successfully, False if user not found
+            bool: True if deactivated, False if user not found or already inactive
         """
-        user = User.query.get(user_id)
-        if not user:
-            return False
+        return bool(UserService.deactivate_users([user_id]))
 
-        db.session.delete(user)
+    @staticmethod
+    def deactivate_users(user_ids: List[int]) -> List[int]:
+        """Deactivate several users in one UPDATE.
+
+        Args:
+            user_ids (list): IDs of the users to deactivate
+
+        Returns:
+            list: IDs that were active and are now deactivated
+        """
+        deactivated = db.session.execute(
+            update(User)
+            .where(User.id.in_(user_ids), User.is_active.is_(True))
+            .values(is_active=False, version=User.version + 1)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
         db.session.commit()
-        return True
+
+        if deactivated:
+            _users_changed()
+        return sorted(deactivated)
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """Get user cache counters.
+
+        Returns:
+            dict: Hit, miss and eviction counters of this worker's user cache
+        """
+        return get_user_cache().stats()
 
     @staticmethod
     def authenticate_user(username: str, password: str) -> Optional[Dict[str, Any]]:
@@ -136,13 +605,32 @@ class UserService:
 
         Returns:
             dict: User data if authentication successful, None otherwise
+
+        Raises:
+            HashingBusyError: If the password hashing queue is full
         """
-        user = User.query.filter_by(username=username).first()
-        if user and user.verify_password(password):
-            validated_data = user_schema.dump(user)
+        user = User.query.filter_by(username=username, is_active=True).first()
+        if user and get_password_hasher().verify(user.password_hash, password):
+            validated_data = user_serializer.dump(user)
             return validated_data
         return None
 
+    @staticmethod
+    def enqueue_report(validated_data: Dict[str, Any]) -> None:
+        """Queue a report for a batched background insert.
+
+        Args:
+            validated_data (dict): Validated report request data
+
+        Raises:
+            ReportQueueFullError: If the ingestion queue is full
+        """
+        get_report_queue().submit({
+            "user_id": validated_data.get("target_id"),
+            "reason": validated_data["reason"],
+            "created_at": datetime.utcnow(),
+        })
+
     @staticmethod
     def report_user_new(Validated_data):
         target_id = Validated_data.get("target_id")
@@ -150,6 +638,42 @@ class UserService:
         reported_user = Report()
         reported_user.user_id = target_id
         reported_user.reason = reason
+        reported_user.created_at = datetime.utcnow()
 
         db.session.add(reported_user)
-        db.session.commit()
\ No newline at end of file
+        increment_report_counts([(target_id, reported_user.created_at)])
+        db.session.commit()
+
+    @staticmethod
+    def get_most_reported_users(days: int, limit: int) -> List[Dict[str, Any]]:
+        """Get the users with the most reports over recent days.
+
+        Reads the per-day counter table, so the cost depends on the
+        number of reported users in the window, not on the number of
+        reports.
+
+        Args:
+            days (int): Size of the window in days, including today
+            limit (int): Maximum number of users to return
+
+        Returns:
+            list: Users with their report counts, most reported first
+        """
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        totals = (
+            select(ReportCount.user_id, func.sum(ReportCount.count).label("report_count"))
+            .where(ReportCount.day >= since)
+            .group_by(ReportCount.user_id)
+            .order_by(func.sum(ReportCount.count).desc(), ReportCount.user_id)
+            .limit(limit)
+            .subquery()
+        )
+        rows = db.session.execute(
+            select(totals.c.user_id, User.username, totals.c.report_count)
+            .join(User, User.id == totals.c.user_id)
+            .order_by(totals.c.report_count.desc(), totals.c.user_id)
+        ).all()
+        return [
+            {"user_id": row.user_id, "username": row.username, "report_count": int(row.report_count)}
+            for row in rows
+        ]
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Bloom filter for cheap negative membership checks."""
+import hashlib
+import math
+import threading
+from typing import Iterable, Tuple
+
+
+class BloomFilter:
+    """Fixed-size set of strings that answers "definitely not" or "maybe".
+
+    A miss is certain, a hit is wrong with probability ``error_rate``
+    while no more than ``capacity`` items have been added. Items cannot
+    be removed. Each key is hashed once; its bit positions are derived
+    from the two halves of the digest (Kirsch-Mitzenmacher double hashing).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """Initialize an empty filter.
+
+        Args:
+            capacity (int): Number of items the filter is sized for
+            error_rate (float): False positive rate at ``capacity`` items
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError('capacity must be positive and error_rate between 0 and 1')
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str) -> Tuple[int, ...]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return tuple((first + i * second) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        """Add a key to the filter."""
+        positions = self._positions(key)
+        # Setting a bit is a read-modify-write of its byte
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        """Add many keys to the filter."""
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def saturated(self) -> bool:
+        """Whether more items than the filter is sized for were added."""
+        return self.count > self.capacity
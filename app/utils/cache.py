@@ -0,0 +1,108 @@
+"""In-process caching primitives."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUTTLCache:
+    """Thread-safe cache bounded by size (LRU eviction) and entry age (TTL).
+
+    A ``maxsize`` of 0 disables the cache: every lookup is a miss and
+    nothing is stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        """Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries
+            ttl (float): Seconds an entry stays valid after being stored
+            clock (callable, optional): Monotonic time source
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for a key.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or ``default`` if absent or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> Optional[Any]:
+        """Remove a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The removed value if it was present and unexpired, None otherwise
+        """
+        with self._lock:
+            entry = self._data.pop(key, None)
+        if entry is None or entry[0] <= self._clock():
+            return None
+        return entry[1]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counters.
+
+        Returns:
+            dict: Cache counters and current size
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
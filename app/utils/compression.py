@@ -0,0 +1,82 @@
+"""Negotiated gzip/brotli compression of response bodies."""
+import gzip
+from flask import Flask, Response, request
+from app.utils.etag import ENCODING_SUFFIXES, encoded_etag
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli
+    brotli = None
+
+
+def _encodings():
+    # Preference order when the client accepts several with equal quality
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress_response(response: Response, config) -> Response:
+    """Compress a response body if the client accepts it and it is worth it.
+
+    Streamed responses, bodies below ``COMPRESS_MIN_SIZE`` bytes and
+    mimetypes outside ``COMPRESS_MIMETYPES`` are left alone. The ETag
+    gets a per-encoding suffix, since the bytes now differ per encoding,
+    and stays strong so it can still be used in ``If-Match``.
+
+    Args:
+        response (Response): Response to compress
+        config: Application configuration
+
+    Returns:
+        Response: The same response, possibly with a compressed body
+    """
+    if response.status_code == 304:
+        _echo_encoded_etag(response)
+        return response
+    if (response.status_code < 200 or response.status_code == 204
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in config['COMPRESS_MIMETYPES']):
+        return response
+
+    data = response.get_data()
+    if len(data) < config['COMPRESS_MIN_SIZE']:
+        return response
+
+    # The representation now depends on Accept-Encoding, compressed or not
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(_encodings())
+    if encoding == 'br':
+        data = brotli.compress(data, quality=config['COMPRESS_BROTLI_QUALITY'])
+    elif encoding == 'gzip':
+        data = gzip.compress(data, compresslevel=config['COMPRESS_GZIP_LEVEL'], mtime=0)
+    else:
+        return response
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(encoded_etag(etag, encoding), weak=weak)
+    return response
+
+
+def _echo_encoded_etag(response: Response) -> None:
+    # A 304 has no body to compress; send back the encoded tag the client
+    # revalidated with, so its cached headers keep the same tag
+    etag, weak = response.get_etag()
+    if etag:
+        for encoding in ENCODING_SUFFIXES:
+            if encoded_etag(etag, encoding) in request.if_none_match:
+                response.set_etag(encoded_etag(etag, encoding), weak=weak)
+                return
+
+
+def init_compression(app: Flask) -> None:
+    """Compress eligible responses of an application.
+
+    Args:
+        app (Flask): Application whose responses are compressed
+    """
+    @app.after_request
+    def compress(response):
+        return compress_response(response, app.config)
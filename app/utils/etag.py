@@ -0,0 +1,105 @@
+"""Entity tags for user resources."""
+import hashlib
+from typing import Iterable, Optional, Tuple
+from werkzeug.datastructures import ETags
+from werkzeug.http import quote_etag, unquote_etag
+
+
+def user_etag(user_id: int, version: int) -> str:
+    """Build the strong ETag of a user.
+
+    Args:
+        user_id (int): User ID
+        version (int): User version
+
+    Returns:
+        str: Quoted ETag header value, e.g. ``"42-v3"``
+    """
+    return quote_etag(f'{user_id}-v{version}')
+
+
+def page_etag(versions: Iterable[Tuple[int, int]], next_cursor: Optional[str]) -> str:
+    """Build the strong ETag of a page of users.
+
+    A page is fully determined by the IDs and versions it contains and
+    by whether another page follows, so the tag can be computed from a
+    query that selects only those columns.
+
+    Args:
+        versions (iterable): ``(id, version)`` of each user on the page, in order
+        next_cursor (str, optional): Cursor of the next page
+
+    Returns:
+        str: Quoted ETag header value
+    """
+    digest = hashlib.sha1()
+    for user_id, version in versions:
+        digest.update(f'{user_id}:{version},'.encode())
+    digest.update((next_cursor or '').encode())
+    return quote_etag(digest.hexdigest())
+
+
+# Appended to the ETag of a compressed body, which is a different
+# representation of the same resource than the uncompressed one
+ENCODING_SUFFIXES = {'br': '-br', 'gzip': '-gz'}
+
+
+def encoded_etag(tag: str, encoding: str) -> str:
+    """Build the tag of a representation compressed with an encoding.
+
+    Args:
+        tag (str): Unquoted tag of the uncompressed representation
+        encoding (str): Content coding, e.g. ``gzip``
+
+    Returns:
+        str: Unquoted tag, e.g. ``42-v3-gz``
+    """
+    return tag + ENCODING_SUFFIXES[encoding]
+
+
+def strip_encoding(tag: str) -> str:
+    """Remove the content-coding suffix from an unquoted tag, if any."""
+    for suffix in ENCODING_SUFFIXES.values():
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)]
+    return tag
+
+
+def etag_matches(if_none_match: ETags, etag: str) -> bool:
+    """Check an ``If-None-Match`` header against a quoted ETag.
+
+    Tags of compressed representations match too, since the client's
+    copy is current whichever encoding it was received in.
+
+    Args:
+        if_none_match (ETags): Parsed ``If-None-Match`` header
+        etag (str): Current quoted ETag of the resource
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    tag, _ = unquote_etag(etag)
+    if if_none_match.star_tag:
+        return True
+    return any(strip_encoding(other) == tag for other in if_none_match.as_set(include_weak=True))
+
+
+def if_match_version(user_id: int, if_match: ETags) -> Optional[int]:
+    """Extract the version a client expects from its ``If-Match`` header.
+
+    Only strong tags are considered, as ``If-Match`` requires; the tag
+    of a compressed representation names the same version.
+
+    Args:
+        user_id (int): ID of the user being modified
+        if_match (ETags): Parsed ``If-Match`` header
+
+    Returns:
+        int: Expected version, or None if no tag refers to this user
+    """
+    prefix = f'{user_id}-v'
+    for tag in if_match.as_set():
+        tag = strip_encoding(tag)
+        if tag.startswith(prefix) and tag[len(prefix):].isdigit():
+            return int(tag[len(prefix):])
+    return None
@@ -0,0 +1,51 @@
+"""Generation counters for O(1) cache invalidation."""
+import struct
+import threading
+from typing import Optional
+from app.utils.shared_file import SharedFile
+
+_COUNTER = struct.Struct('=q')
+
+
+class GenerationCounter:
+    """Monotonic counter that is bumped whenever the data it stamps changes.
+
+    Caches include the current value in their keys, so a single bump
+    makes every older entry unreachable without scanning for it.
+
+    By default the counter lives in process memory. With a ``path`` it
+    is kept in a small memory-mapped file shared by every process that
+    opens it, e.g. the workers of one server: reads are a plain memory
+    access and bumps take an exclusive ``flock`` on the file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the counter.
+
+        Args:
+            path (str, optional): File backing a counter shared between processes
+        """
+        self._lock = threading.Lock()
+        self._value = 0
+        self._file = SharedFile(path, _COUNTER.size) if path else None
+
+    def value(self) -> int:
+        """Return the current generation."""
+        if self._file is not None:
+            return _COUNTER.unpack_from(self._file.map)[0]
+        return self._value
+
+    def bump(self) -> int:
+        """Advance to a new generation.
+
+        Returns:
+            int: The new generation
+        """
+        if self._file is not None:
+            with self._file.locked() as mapping:
+                value = _COUNTER.unpack_from(mapping)[0] + 1
+                _COUNTER.pack_into(mapping, 0, value)
+                return value
+        with self._lock:
+            self._value += 1
+            return self._value
@@ -0,0 +1,78 @@
+"""JSON provider backed by orjson when it is installed."""
+from datetime import date
+from typing import Any
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _default(o: Any) -> Any:
+    # Same ISO 8601 output as marshmallow's DateTime field, instead of
+    # Flask's RFC 822 dates
+    if isinstance(o, date):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson.
+
+    orjson writes datetimes natively in the same ISO 8601 form as
+    ``UserSchema``, and the stdlib fallback (used without orjson, or when
+    a caller passes ``json.dumps`` options orjson lacks) does the same.
+    Output is UTF-8 rather than ASCII-escaped, and keys keep the order of
+    the serialized dicts.
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+    sort_keys = False
+
+    def _options(self, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _indent(self) -> bool:
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as JSON to a string.
+
+        Args:
+            obj: The data to serialize
+            **kwargs: Options for :func:`json.dumps`; any option other than
+                ``indent`` or ``separators`` selects the stdlib encoder
+
+        Returns:
+            str: JSON text
+        """
+        if orjson is None or not set(kwargs) <= {'indent', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default,
+                            option=self._options(bool(kwargs.get('indent')))).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """Deserialize JSON from a string or bytes."""
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize the arguments into an ``application/json`` response.
+
+        Encodes straight to bytes, skipping the intermediate string.
+        """
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default,
+                            option=self._options(self._indent()) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,98 @@
+"""Prometheus request and database metrics.
+
+Metrics are recorded in-process with ``prometheus_client``. To aggregate
+across pre-forked workers, point ``PROMETHEUS_MULTIPROC_DIR`` at an empty
+directory before the server starts; every worker then writes its samples
+to memory-mapped files there and ``/metrics`` merges them on scrape.
+"""
+import os
+import time
+from flask import Flask, Response, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+)
+from prometheus_client import multiprocess
+from app.utils.query_profiler import on_query_timed
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Request latency by endpoint',
+    ['method', 'endpoint']
+)
+REQUEST_COUNT = Counter(
+    'http_requests_total',
+    'Requests by endpoint and status code',
+    ['method', 'endpoint', 'status']
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'http_requests_in_flight',
+    'Requests currently being served',
+    multiprocess_mode='livesum'
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Database queries issued per request',
+    ['endpoint'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+DB_TIME = Histogram(
+    'http_request_db_duration_seconds',
+    'Time spent in database queries per request',
+    ['endpoint']
+)
+
+
+def _endpoint_label() -> str:
+    # The URL rule keeps label cardinality bounded (no raw paths or IDs)
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def _record_query(conn, statement: str, elapsed: float) -> None:
+    if has_request_context():
+        g.metrics_db_time = g.get('metrics_db_time', 0.0) + elapsed
+        g.metrics_db_queries = g.get('metrics_db_queries', 0) + 1
+
+
+def init_metrics(app: Flask) -> None:
+    """Instrument an application and expose ``/metrics``.
+
+    Args:
+        app (Flask): Application to instrument
+    """
+    on_query_timed(_record_query)
+
+    @app.before_request
+    def start_request_metrics():
+        if request.endpoint == 'metrics':
+            return
+        g.metrics_start = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+        endpoint = _endpoint_label()
+        REQUEST_LATENCY.labels(request.method, endpoint).observe(time.perf_counter() - start)
+        REQUEST_COUNT.labels(request.method, endpoint, str(response.status_code)).inc()
+        DB_QUERIES.labels(endpoint).observe(g.get('metrics_db_queries', 0))
+        DB_TIME.labels(endpoint).observe(g.get('metrics_db_time', 0.0))
+        REQUESTS_IN_FLIGHT.dec()
+        g.metrics_done = True
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        # Requests that never reached after_request still leave the gauge
+        if g.pop('metrics_start', None) is not None and not g.get('metrics_done'):
+            REQUESTS_IN_FLIGHT.dec()
+
+    @app.route('/metrics')
+    def metrics():
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,74 @@
+"""Keyset (cursor) pagination helpers."""
+import base64
+import json
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor.
+
+    Args:
+        position (dict): Sort-key values of the last row on the page
+
+    Returns:
+        str: Opaque cursor string
+    """
+    raw = json.dumps(position, separators=(',', ':'), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor (str): Opaque cursor string
+
+    Returns:
+        dict: Sort-key values of the last row on the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(position, dict):
+        raise ValueError('Invalid cursor')
+    return position
+
+
+def parse_page_args(args: Mapping[str, str], default_limit: int,
+                    max_limit: int) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """Read ``limit`` and ``after`` from query parameters.
+
+    The limit is clamped to ``max_limit`` so a client can never request
+    an unbounded page.
+
+    Args:
+        args (Mapping): Request query parameters
+        default_limit (int): Page size used when ``limit`` is absent
+        max_limit (int): Largest page size a client may request
+
+    Returns:
+        tuple: Page size and decoded cursor position (None for the first page)
+
+    Raises:
+        ValueError: If ``limit`` or ``after`` is invalid
+    """
+    raw_limit = args.get('limit')
+    if raw_limit is None:
+        limit = default_limit
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise ValueError('limit must be an integer')
+        if limit < 1:
+            raise ValueError('limit must be positive')
+    limit = min(limit, max_limit)
+
+    after = args.get('after')
+    position = decode_cursor(after) if after else None
+    return limit, position
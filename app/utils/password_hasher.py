@@ -0,0 +1,163 @@
+"""Bounded worker pool for CPU-bound password hashing."""
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, List, Optional
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing queue is full and the request should be retried later."""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Password hashing capacity exhausted')
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """Run password hashing on a process pool with backpressure.
+
+    At most ``workers`` hashes run at once and at most ``queue_depth``
+    more wait for a worker. Anything beyond that fails immediately with
+    :class:`HashingBusyError` instead of tying up a request thread, so
+    cheap read endpoints stay responsive during a login spike.
+
+    With ``workers=0`` hashing runs inline on the calling thread, which
+    is what the test suite uses.
+    """
+
+    def __init__(self, workers: int, queue_depth: int, retry_after: int = 1):
+        """Initialize the hasher.
+
+        Args:
+            workers (int): Number of hashing processes (0 hashes inline)
+            queue_depth (int): Number of hashes allowed to wait for a worker
+            retry_after (int): Seconds clients are told to wait when the queue is full
+        """
+        self.workers = workers
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_depth)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> 'PasswordHasher':
+        """Build a hasher from Flask configuration."""
+        return cls(
+            workers=config['PASSWORD_HASH_WORKERS'],
+            queue_depth=config['PASSWORD_HASH_QUEUE_DEPTH'],
+            retry_after=config['PASSWORD_HASH_RETRY_AFTER']
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily so that pre-forked servers start the pool in each worker
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusyError(self.retry_after)
+        try:
+            if self.workers == 0:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        """Hash a password.
+
+        Args:
+            password (str): The password to hash
+
+        Returns:
+            str: Password hash
+
+        Raises:
+            HashingBusyError: If the hashing queue is full
+        """
+        return self._run(generate_password_hash, password)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """Check a password against a hash.
+
+        Args:
+            password_hash (str): Stored password hash
+            password (str): The password to verify
+
+        Returns:
+            bool: True if password matches, False otherwise
+
+        Raises:
+            HashingBusyError: If the hashing queue is full
+        """
+        return self._run(check_password_hash, password_hash, password)
+
+    def _acquire_up_to(self, count: int) -> int:
+        """Take up to ``count`` free slots without waiting; at least one or fail."""
+        held = 0
+        while held < count and self._slots.acquire(blocking=False):
+            held += 1
+        if not held:
+            raise HashingBusyError(self.retry_after)
+        return held
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch of passwords on part of the pool.
+
+        Each password in flight holds a queue slot, and a batch keeps at
+        most half of the workers busy, so an interactive hash or login
+        waits for at most one batch hash per remaining worker and the
+        queue bound still applies to it.
+
+        Args:
+            passwords (list): Passwords to hash
+
+        Returns:
+            list: Password hashes in input order
+
+        Raises:
+            HashingBusyError: If the hashing queue is full
+        """
+        if self.workers == 0:
+            self._acquire_up_to(1)
+            try:
+                return [generate_password_hash(password) for password in passwords]
+            finally:
+                self._slots.release()
+
+        held = self._acquire_up_to(max(1, self.workers // 2))
+        try:
+            executor = self._get_executor()
+            hashes: List[Optional[str]] = [None] * len(passwords)
+            in_flight = {}
+            for index, password in enumerate(passwords):
+                if len(in_flight) == held:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        hashes[in_flight.pop(future)] = future.result()
+                in_flight[executor.submit(generate_password_hash, password)] = index
+            for future, index in in_flight.items():
+                hashes[index] = future.result()
+            return hashes
+        finally:
+            for _ in range(held):
+                self._slots.release()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Return the password hasher of the current application."""
+    return current_app.extensions['password_hasher']
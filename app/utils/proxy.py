@@ -0,0 +1,41 @@
+"""Client address and scheme behind trusted reverse proxies."""
+from typing import Any, Dict
+from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+
+def _environ_only(environ, start_response):
+    return environ
+
+
+def init_proxy_fix(app: Flask) -> None:
+    """Trust the ``X-Forwarded-For`` and ``X-Forwarded-Proto`` headers.
+
+    Only the last ``PROXY_FIX_HOPS`` values, those appended by the
+    application's own proxies, are used; 0 ignores the headers, so
+    clients cannot spoof the address rate limits are keyed by.
+
+    Args:
+        app (Flask): Application whose requests pass through the proxies
+    """
+    hops = app.config['PROXY_FIX_HOPS']
+    if hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+        # Same rewrite for requests that do not go through app.wsgi_app
+        app.extensions['proxy_fix'] = ProxyFix(_environ_only, x_for=hops, x_proto=hops)
+    else:
+        app.extensions['proxy_fix'] = None
+
+
+def fix_environ(app: Flask, environ: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply an application's proxy settings to a WSGI environ in place.
+
+    Args:
+        app (Flask): Application initialized with :func:`init_proxy_fix`
+        environ (dict): Environ of a request served outside ``app.wsgi_app``
+
+    Returns:
+        dict: The same environ
+    """
+    proxy_fix = app.extensions.get('proxy_fix')
+    return proxy_fix(environ, None) if proxy_fix is not None else environ
@@ -0,0 +1,244 @@
+"""Slow-query logging and query counting for the service layer.
+
+Both are built on the engine's ``before/after_cursor_execute`` events;
+statement timing is shared with the request metrics through
+:func:`on_query_timed`.
+Unlike ``SQLALCHEMY_ECHO``, the slow-query log only formats and emits a
+record for statements over the configured threshold, so it is cheap
+enough to leave on in production.
+"""
+import logging
+import re
+import sys
+import time
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from config.database import db
+
+logger = logging.getLogger('app.sql.slow')
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?')
+_VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*')
+_WHITESPACE = re.compile(r'\s+')
+# Transaction control, e.g. the savepoints of the test harness, is not a query
+_TRANSACTION_CONTROL = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE')
+
+
+def normalize_sql(statement: str) -> str:
+    """Reduce a statement to its shape for logging and grouping.
+
+    Literals and bind placeholders become ``?`` and ``IN``/``VALUES``
+    lists collapse to a single ``(?)``, so statements differing only in
+    their parameters normalize to the same string.
+
+    Args:
+        statement (str): SQL as sent to the DBAPI cursor
+
+    Returns:
+        str: Normalized single-line SQL
+    """
+    sql = _STRING_LITERAL.sub('?', statement)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _VALUE_LIST.sub('(?)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def calling_method() -> str:
+    """Name the service-layer function that issued the current query.
+
+    Returns:
+        str: Qualified name such as ``UserService.get_all_users``, the
+        innermost ``app.services`` function otherwise, or ``'?'``
+    """
+    frame = sys._getframe(1)
+    fallback = '?'
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('app.services.'):
+            code = frame.f_code
+            name = getattr(code, 'co_qualname', code.co_name)
+            if name.startswith('UserService.'):
+                return name
+            if fallback == '?':
+                fallback = f'{module.rsplit(".", 1)[-1]}.{name}'
+        frame = frame.f_back
+    return fallback
+
+
+QueryHook = Callable[[Connection, str, float], None]
+
+_query_hooks: List[QueryHook] = []
+
+
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    # Pushed and popped for every statement, so the stack stays balanced
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    for hook in _query_hooks:
+        hook(conn, statement, elapsed)
+
+
+def _discard_timer(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start
+    # so it neither lingers on the pooled connection nor pairs with a later one
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None:
+        starts = conn.info.get('query_start')
+        if starts:
+            starts.pop()
+
+
+def on_query_timed(hook: QueryHook) -> None:
+    """Call a function with the duration of every statement on any engine.
+
+    All hooks share one timer per statement, started and stopped by
+    listeners on the ``Engine`` class, which also cover engines created
+    later and the sync side of async engines.
+
+    Args:
+        hook (callable): Called with the connection, the statement and its
+            duration in seconds; registering it again has no effect
+    """
+    if not _query_hooks:
+        event.listen(Engine, 'before_cursor_execute', _start_timer)
+        event.listen(Engine, 'after_cursor_execute', _stop_timer)
+        event.listen(Engine, 'handle_error', _discard_timer)
+    if hook not in _query_hooks:
+        _query_hooks.append(hook)
+
+
+# Slow-query log of each engine it is attached to
+_slow_query_loggers: 'weakref.WeakKeyDictionary[Engine, SlowQueryLogger]' = weakref.WeakKeyDictionary()
+
+
+class SlowQueryLogger:
+    """Log statements that take longer than a threshold."""
+
+    def __init__(self, threshold_ms: float):
+        """Initialize the logger.
+
+        Args:
+            threshold_ms (float): Minimum duration of a logged statement
+        """
+        self.threshold = threshold_ms / 1000
+
+    def attach(self, engine: Engine) -> None:
+        """Log the slow statements executed on an engine."""
+        _slow_query_loggers[engine] = self
+        on_query_timed(_log_slow_query)
+
+    def log(self, statement: str, elapsed: float) -> None:
+        """Log a statement if it took at least the threshold.
+
+        Args:
+            statement (str): SQL as sent to the DBAPI cursor
+            elapsed (float): Duration in seconds
+        """
+        if elapsed >= self.threshold:
+            logger.warning(
+                "Slow query (%.1f ms) in %s: %s",
+                elapsed * 1000, calling_method(), normalize_sql(statement)
+            )
+
+
+def _log_slow_query(conn: Connection, statement: str, elapsed: float) -> None:
+    slow_query_logger = _slow_query_loggers.get(conn.engine)
+    if slow_query_logger is not None:
+        slow_query_logger.log(statement, elapsed)
+
+
+def init_query_profiler(app: Flask) -> None:
+    """Attach the slow-query log to the application's engine.
+
+    Disabled when ``SLOW_QUERY_MS`` is negative.
+
+    Args:
+        app (Flask): Application whose engine is profiled
+    """
+    threshold = app.config['SLOW_QUERY_MS']
+    if threshold < 0:
+        return
+    with app.app_context():
+        SlowQueryLogger(threshold).attach(db.engine)
+
+
+class QueryCounter:
+    """Record the normalized statements executed on an engine."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(_TRANSACTION_CONTROL):
+            self.statements.append(normalize_sql(statement))
+
+    @property
+    def count(self) -> int:
+        """Number of statements executed."""
+        return len(self.statements)
+
+    def repeated(self, max_repeats: int) -> List[str]:
+        """Return SELECTs executed more than ``max_repeats`` times."""
+        return [
+            statement for statement, times in Counter(self.statements).items()
+            if times > max_repeats and statement.upper().startswith('SELECT')
+        ]
+
+
+@contextmanager
+def count_queries(engine: Optional[Engine] = None) -> Iterator[QueryCounter]:
+    """Count the statements executed inside a block.
+
+    Args:
+        engine (Engine, optional): Engine to watch; defaults to ``db.engine``
+
+    Yields:
+        QueryCounter: Statements recorded so far
+    """
+    engine = engine if engine is not None else db.engine
+    counter = QueryCounter()
+    event.listen(engine, 'after_cursor_execute', counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'after_cursor_execute', counter._record)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, max_repeats: int = 1,
+                       engine: Optional[Engine] = None) -> Iterator[QueryCounter]:
+    """Fail when a block issues too many queries or repeats a SELECT.
+
+    A SELECT of the same shape running more than ``max_repeats`` times
+    is the signature of an N+1 loop.
+
+    Args:
+        max_queries (int): Maximum number of statements
+        max_repeats (int): Maximum executions of one normalized SELECT
+        engine (Engine, optional): Engine to watch; defaults to ``db.engine``
+
+    Raises:
+        AssertionError: If either limit is exceeded
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    listing = '\n'.join(counter.statements)
+    assert counter.count <= max_queries, \
+        f'{counter.count} queries executed, expected at most {max_queries}:\n{listing}'
+    repeated = counter.repeated(max_repeats)
+    assert not repeated, \
+        f'Statements repeated more than {max_repeats} times (N+1?):\n' + '\n'.join(repeated)
@@ -0,0 +1,252 @@
+"""Token-bucket rate limiting of blueprint routes."""
+import hashlib
+import math
+import mmap
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from app.utils.shared_file import SharedFile
+
+# Slot of the shared store: key hash (0 = empty), tokens left, last refill time
+_SLOT = struct.Struct('=Qdd')
+
+# Slots probed for a key before the stalest one is reused
+_PROBES = 8
+
+
+def parse_limit(value: str) -> Optional[Tuple[float, float]]:
+    """Parse a ``'<burst>/<seconds>'`` limit.
+
+    Args:
+        value (str): Limit such as ``'10/60'``: bursts of 10 requests,
+            refilled at 10 per 60 seconds. Empty disables the limit.
+
+    Returns:
+        tuple: ``(capacity, tokens per second)``, or None if disabled
+
+    Raises:
+        ValueError: If the limit is malformed
+    """
+    if not value:
+        return None
+    burst, _, seconds = value.partition('/')
+    capacity, period = float(burst), float(seconds)
+    if capacity <= 0 or period <= 0:
+        raise ValueError(f'Invalid rate limit: {value!r}')
+    return capacity, capacity / period
+
+
+def _take(tokens: float, updated: float, now: float, capacity: float, rate: float) -> Tuple[float, float]:
+    """Refill a bucket up to ``now`` and try to take one token.
+
+    Returns:
+        tuple: Tokens left and seconds until a token is available (0 if one was taken)
+    """
+    # Clamped so a clock step backwards cannot drain the bucket
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class TokenBuckets:
+    """Token buckets kept in process memory.
+
+    Each worker limits on its own, so with N workers a client can get N
+    times the configured rate. The least recently used buckets beyond
+    ``maxsize`` are dropped; a dropped bucket restarts full.
+    """
+
+    def __init__(self, maxsize: int = 100000, clock: Callable[[], float] = time.time):
+        """Initialize the store.
+
+        Args:
+            maxsize (int): Maximum number of buckets
+            clock (callable, optional): Time source in seconds
+        """
+        self.maxsize = maxsize
+        self._clock = clock
+        self._buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: float, rate: float) -> float:
+        """Take a token from a bucket.
+
+        Args:
+            key (str): Bucket key
+            capacity (float): Bucket size
+            rate (float): Tokens added per second
+
+        Returns:
+            float: 0 if the request may proceed, else seconds to wait
+        """
+        now = self._clock()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens, wait = _take(tokens, updated, now, capacity, rate)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class SharedTokenBuckets:
+    """Token buckets in a memory-mapped file shared by every process that opens it.
+
+    The file is a fixed table of slots addressed by a hash of the key,
+    so the workers of one server enforce a single limit per key. Updates
+    hold the file's exclusive lock. When all probed slots are taken by
+    other keys, the least recently used one is reused.
+    """
+
+    def __init__(self, path: str, slots: int = 65536, clock: Callable[[], float] = time.time):
+        """Initialize the store.
+
+        Args:
+            path (str): File backing the buckets
+            slots (int): Number of buckets the file holds
+            clock (callable, optional): Time source in seconds
+        """
+        self.slots = slots
+        self._clock = clock
+        self._file = SharedFile(path, slots * _SLOT.size)
+
+    def _slot(self, mapping: mmap.mmap, key_hash: int) -> int:
+        """Return the offset of the slot holding, or to hold, a key."""
+        start = key_hash % self.slots
+        stalest, stalest_time = None, math.inf
+        for probe in range(_PROBES):
+            offset = (start + probe) % self.slots * _SLOT.size
+            slot_hash, _, updated = _SLOT.unpack_from(mapping, offset)
+            if slot_hash in (key_hash, 0):
+                return offset
+            if updated < stalest_time:
+                stalest, stalest_time = offset, updated
+        _SLOT.pack_into(mapping, stalest, 0, 0.0, 0.0)
+        return stalest
+
+    def consume(self, key: str, capacity: float, rate: float) -> float:
+        """Take a token from a bucket.
+
+        Args:
+            key (str): Bucket key
+            capacity (float): Bucket size
+            rate (float): Tokens added per second
+
+        Returns:
+            float: 0 if the request may proceed, else seconds to wait
+        """
+        key_hash = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+        with self._file.locked() as mapping:
+            now = self._clock()
+            offset = self._slot(mapping, key_hash)
+            slot_hash, tokens, updated = _SLOT.unpack_from(mapping, offset)
+            if slot_hash == 0:
+                tokens, updated = capacity, now
+            tokens, wait = _take(tokens, updated, now, capacity, rate)
+            _SLOT.pack_into(mapping, offset, key_hash, tokens, now)
+        return wait
+
+
+class RateLimiter:
+    """Per-endpoint token-bucket limits keyed by client IP, username and JWT identity.
+
+    ``limits`` maps an endpoint name to ``{scope: (capacity, rate)}``
+    where scope is ``'ip'``, ``'username'`` (the ``username`` field of
+    the JSON body) or ``'identity'`` (the JWT identity, if the request
+    carries a valid token). A request proceeds only if every bucket that
+    applies to it has a token. Client IPs come from ``request.remote_addr``,
+    which honours ``X-Forwarded-For`` only with ``PROXY_FIX_HOPS`` set.
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, Tuple[float, float]]], buckets):
+        """Initialize the limiter.
+
+        Args:
+            limits (dict): Endpoint name to per-scope limits
+            buckets: :class:`TokenBuckets` or :class:`SharedTokenBuckets`
+        """
+        self.limits = limits
+        self.buckets = buckets
+
+    @classmethod
+    def from_config(cls, config) -> 'RateLimiter':
+        """Build a rate limiter from Flask configuration."""
+        limits = {}
+        for endpoint, scopes in config['RATE_LIMITS'].items():
+            parsed = {scope: parse_limit(value) for scope, value in scopes.items()}
+            limits[endpoint] = {scope: limit for scope, limit in parsed.items() if limit is not None}
+        if config['RATE_LIMIT_FILE']:
+            buckets = SharedTokenBuckets(config['RATE_LIMIT_FILE'], config['RATE_LIMIT_SLOTS'])
+        else:
+            buckets = TokenBuckets(config['RATE_LIMIT_SLOTS'])
+        return cls(limits, buckets)
+
+    def check(self, endpoint: str, keys: Dict[str, Optional[str]]) -> float:
+        """Take a token from every bucket of a request.
+
+        Buckets are taken from in order, stopping at the first exhausted
+        one, so a throttled request does not drain the others.
+
+        Args:
+            endpoint (str): Endpoint name
+            keys (dict): Scope to the request's key in it; None skips the scope
+
+        Returns:
+            float: 0 if the request may proceed, else seconds until it may be retried
+        """
+        for scope, (capacity, rate) in self.limits.get(endpoint, {}).items():
+            key = keys.get(scope)
+            if key is not None:
+                wait = self.buckets.consume(f'{endpoint}:{scope}:{key}', capacity, rate)
+                if wait:
+                    return wait
+        return 0.0
+
+
+def _jwt_identity() -> Optional[str]:
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        # Invalid tokens are rejected by the view, if it requires one
+        return None
+    identity = get_jwt_identity()
+    return None if identity is None else str(identity)
+
+
+def _request_keys(scopes) -> Dict[str, Optional[str]]:
+    keys = {'ip': request.remote_addr}
+    if 'username' in scopes:
+        body = request.get_json(silent=True)
+        username = body.get('username') if isinstance(body, dict) else None
+        keys['username'] = username if isinstance(username, str) else None
+    if 'identity' in scopes:
+        keys['identity'] = _jwt_identity()
+    return keys
+
+
+def enforce_rate_limits():
+    """``before_request`` hook answering 429 once a client exhausts a bucket.
+
+    Runs before the view, so throttled requests never reach the
+    database or the password hasher.
+    """
+    if not current_app.config['RATE_LIMIT_ENABLED']:
+        return None
+    limiter = get_rate_limiter()
+    scopes = limiter.limits.get(request.endpoint)
+    if not scopes:
+        return None
+    wait = limiter.check(request.endpoint, _request_keys(scopes))
+    if wait:
+        return {'message': 'Too many requests'}, 429, {'Retry-After': str(math.ceil(wait))}
+    return None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the rate limiter of the current application."""
+    return current_app.extensions['rate_limiter']
@@ -0,0 +1,72 @@
+"""Memory-mapped files shared between the worker processes of a host."""
+import fcntl
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class SharedFile:
+    """Fixed-size file mapped into memory, with an exclusive lock.
+
+    The file is opened lazily and reopened in a forked child: ``flock``
+    locks belong to the open file description, so workers forked from a
+    preloading master would otherwise share one and never exclude each
+    other.
+    """
+
+    def __init__(self, path: str, size: int):
+        """Initialize the file.
+
+        Args:
+            path (str): File path; created and zero-filled if missing or short
+            size (int): Number of bytes mapped
+        """
+        self.path = path
+        self.size = size
+        self._thread_lock = threading.Lock()
+        self._pid = None
+        self._fd = None
+        self._map = None
+
+    @property
+    def map(self) -> mmap.mmap:
+        """The mapping of the file in this process."""
+        if self._pid != os.getpid():
+            with self._thread_lock:
+                self._reopen_if_forked()
+        return self._map
+
+    def _reopen_if_forked(self) -> None:
+        # Called with the thread lock held, so only one thread of a
+        # process opens the file and none sees a mapping being replaced
+        if self._pid == os.getpid():
+            return
+        if self._map is not None:
+            # Copies inherited from the parent process; no thread of
+            # this process has been handed them
+            self._map.close()
+            os.close(self._fd)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(fd).st_size < self.size:
+            os.ftruncate(fd, self.size)
+        self._fd, self._map = fd, mmap.mmap(fd, self.size)
+        # Published last: threads skip the lock once the pid matches
+        self._pid = os.getpid()
+
+    @contextmanager
+    def locked(self) -> Iterator[mmap.mmap]:
+        """Hold the file exclusively against other threads and processes.
+
+        Yields:
+            mmap.mmap: The mapping of the file
+        """
+        # flock does not exclude threads sharing the file descriptor
+        with self._thread_lock:
+            self._reopen_if_forked()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield self._map
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
@@ -0,0 +1,4 @@
+"""ASGI entry point, e.g. ``uvicorn asgi:app``."""
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1,70 @@
+"""Benchmark JSON encoding and compression of the user list response.
+
+Compares Flask's default JSON provider with the fast provider on a
+``GET /api/users`` page, then measures the bytes on the wire and the
+time to compress that body for each content encoding and level.
+
+Usage:
+    python -m benchmarks.bench_json [--users N] [--repeat N]
+"""
+import argparse
+import gzip
+import json
+import os
+import timeit
+from flask.json.provider import DefaultJSONProvider
+from benchmarks.bench_serializer import make_users
+
+
+def _best(func, repeat):
+    number = 20
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+
+def run(users=200, repeat=5):
+    """Time both providers and every encoding for one page of users.
+
+    Returns:
+        dict: Encode times in milliseconds and body sizes in bytes
+    """
+    os.environ.update(DATABASE_URL='sqlite://', COMPRESS_ENABLED='0')
+    from app import create_app
+    from app.schemas.user_schema import users_serializer
+    from app.utils.compression import brotli
+    from app.utils.json_provider import FastJSONProvider
+
+    app = create_app('production')
+    payload = {'users': users_serializer.dump(make_users(users)), 'next_cursor': None}
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+
+    with app.app_context():
+        body = fast_provider.response(payload).get_data()
+        result = {
+            'users': users,
+            'encode_ms': {
+                'default': round(_best(lambda: default_provider.response(payload), repeat), 4),
+                'fast': round(_best(lambda: fast_provider.response(payload), repeat), 4),
+            },
+            'bytes': {'identity': len(body)},
+            'compress_ms': {},
+        }
+
+    for level in (1, 6, 9):
+        name = f'gzip-{level}'
+        result['bytes'][name] = len(gzip.compress(body, compresslevel=level))
+        result['compress_ms'][name] = round(_best(lambda: gzip.compress(body, compresslevel=level), repeat), 4)
+    if brotli is not None:
+        for quality in (1, 5, 11):
+            name = f'br-{quality}'
+            result['bytes'][name] = len(brotli.compress(body, quality=quality))
+            result['compress_ms'][name] = round(_best(lambda: brotli.compress(body, quality=quality), repeat), 4)
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.users, args.repeat), indent=2))
@@ -0,0 +1,81 @@
+"""Benchmark autocomplete latency of user search.
+
+Seeds an in-memory SQLite database by default, which exercises the
+prefix index fallback. Point ``--database-url`` at PostgreSQL (with the
+trigram migration applied) to measure the pg_trgm backend instead.
+
+Usage:
+    python -m benchmarks.bench_search [--users N] [--queries N] [--database-url URL]
+"""
+import argparse
+import json
+import os
+import random
+import string
+import time
+
+
+def percentile(samples, pct):
+    """Return the ``pct`` percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(users=100000, queries=1000, database_url='sqlite://', seed=42):
+    """Seed users and time prefix searches of 1 to 4 characters.
+
+    Returns:
+        dict: Latency percentiles in milliseconds
+    """
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app
+    from app.models.user import User
+    from app.services.user_service import UserService
+    from config.database import db
+    from sqlalchemy import insert
+
+    rng = random.Random(seed)
+    app = create_app('production')
+    with app.app_context():
+        db.create_all()
+        names = [''.join(rng.choices(string.ascii_lowercase, k=8)) for _ in range(users)]
+        rows = [
+            {'username': f'{name}{i}', 'email': f'{name}{i}@example.com', 'password_hash': 'x',
+             'first_name': name.capitalize()}
+            for i, name in enumerate(names)
+        ]
+        for start in range(0, len(rows), 5000):
+            db.session.execute(insert(User), rows[start:start + 5000])
+        db.session.commit()
+
+        # The first search builds the index; time it separately
+        start = time.perf_counter()
+        UserService.search_users('a', 20)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        samples = []
+        for _ in range(queries):
+            query = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 4)))
+            start = time.perf_counter()
+            UserService.search_users(query, 20)
+            samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'backend': database_url.split(':', 1)[0],
+        'users': users,
+        'queries': queries,
+        'index_build_ms': round(build_ms, 2),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3)
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--database-url', default='sqlite://')
+    args = parser.parse_args()
+    print(json.dumps(run(args.users, args.queries, args.database_url), indent=2))
@@ -0,0 +1,60 @@
+"""Benchmark the compiled user serializer against marshmallow.
+
+Usage:
+    python -m benchmarks.bench_serializer [--repeat N]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime
+from app.models.user import User
+from app.schemas.user_schema import users_schema, users_serializer
+
+
+def make_users(count):
+    """Build transient users with every dumped field populated."""
+    users = []
+    for i in range(count):
+        user = User(
+            username=f'user{i}',
+            email=f'user{i}@example.com',
+            password_hash='hash',
+            first_name='First',
+            last_name='Last',
+            bio='Bio',
+            country='NL'
+        )
+        user.id = i
+        user.created_at = user.updated_at = datetime(2024, 1, 1, 12, 0, 0, 123456)
+        user.is_active = True
+        users.append(user)
+    return users
+
+
+def run(sizes=(1, 100, 10000), repeat=5):
+    """Time both serializers for each list size.
+
+    Returns:
+        list: One result dict per size with best-of-``repeat`` timings
+    """
+    results = []
+    for size in sizes:
+        users = make_users(size)
+        assert users_serializer.dump(users) == users_schema.dump(users)
+        number = max(1, 10000 // size)
+        marshmallow_time = min(timeit.repeat(lambda: users_schema.dump(users), number=number, repeat=repeat)) / number
+        compiled_time = min(timeit.repeat(lambda: users_serializer.dump(users), number=number, repeat=repeat)) / number
+        results.append({
+            'users': size,
+            'marshmallow_ms': round(marshmallow_time * 1000, 4),
+            'compiled_ms': round(compiled_time * 1000, 4),
+            'speedup': round(marshmallow_time / compiled_time, 2)
+        })
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(repeat=args.repeat), indent=2))
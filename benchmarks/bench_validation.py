@@ -0,0 +1,48 @@
+"""Benchmark per-request validation cost of user payloads.
+
+Compares building a schema on every request (the previous controller
+behaviour) with the cached schemas from ``app.schemas.validation``.
+
+Usage:
+    python -m benchmarks.bench_validation [--repeat N]
+"""
+import argparse
+import json
+import timeit
+from app.schemas.user_schema import UserSchema
+from app.schemas.validation import get_schema
+
+PAYLOAD = {
+    'username': 'testuser',
+    'email': 'test@example.com',
+    'password': 'Test123!@#',
+    'first_name': 'Test',
+    'last_name': 'User'
+}
+
+
+def run(repeat=5, number=2000):
+    """Time create and partial-update validation both ways.
+
+    Returns:
+        list: One result dict per schema configuration, in microseconds
+    """
+    results = []
+    for name, options in (('create', {}), ('update', {'partial': True})):
+        cached = get_schema(UserSchema, **options)
+        per_request = min(timeit.repeat(lambda: UserSchema(**options).load(PAYLOAD), number=number, repeat=repeat))
+        shared = min(timeit.repeat(lambda: cached.load(PAYLOAD), number=number, repeat=repeat))
+        results.append({
+            'schema': name,
+            'per_request_us': round(per_request / number * 1e6, 2),
+            'cached_us': round(shared / number * 1e6, 2),
+            'speedup': round(per_request / shared, 2)
+        })
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(repeat=args.repeat), indent=2))
@@ -0,0 +1,91 @@
+"""Asyncio database engine for the ASGI serving mode.
+
+The async engine shares the sync engine's URL and pool settings but
+uses an asyncio driver (asyncpg for PostgreSQL, aiosqlite for SQLite).
+It lives next to Flask-SQLAlchemy's engine; the sync path is unchanged.
+"""
+from typing import Any, Dict, Optional
+from flask import Flask, current_app
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+# Asyncio driver used for each sync driver name
+_ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+}
+
+
+def async_database_url(database_uri: str) -> str:
+    """Translate a sync database URI to its asyncio driver.
+
+    Args:
+        database_uri (str): SQLAlchemy database URI
+
+    Returns:
+        str: The same database with an asyncio driver
+
+    Raises:
+        ValueError: If no asyncio driver is known for the URI
+    """
+    url = make_url(database_uri)
+    if url.drivername not in _ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver for {url.drivername}")
+    return url.set(drivername=_ASYNC_DRIVERS[url.drivername]).render_as_string(hide_password=False)
+
+
+class AsyncDatabase:
+    """Lazily created async engine and session factory."""
+
+    def __init__(self, url: str, engine_options: Dict[str, Any]):
+        """Initialize the async database.
+
+        Args:
+            url (str): Async database URL
+            engine_options (dict): Keyword arguments for ``create_async_engine``
+        """
+        self.url = url
+        self.engine_options = engine_options
+        self._engine: Optional[AsyncEngine] = None
+        self._sessionmaker: Optional[async_sessionmaker] = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Return the engine, creating it on first use."""
+        if self._engine is None:
+            self._engine = create_async_engine(self.url, **self.engine_options)
+            self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False)
+        return self._engine
+
+    def session(self) -> AsyncSession:
+        """Return a new session; use it as an async context manager."""
+        if self._sessionmaker is None:
+            self.engine  # noqa: B018 - creates the engine and session factory
+        return self._sessionmaker()
+
+    async def dispose(self) -> None:
+        """Close every pooled connection."""
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._sessionmaker = None
+
+
+def init_async_db(app: Flask) -> None:
+    """Register the async database for an application.
+
+    Must run after ``configure_engine_options`` so pool settings have
+    been adapted to the driver.
+    """
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    # The instrumented sync pool cannot serve asyncio connections
+    options.pop('poolclass', None)
+    url = app.config.get('ASYNC_DATABASE_URL') or async_database_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.extensions['async_db'] = AsyncDatabase(url, options)
+
+
+def get_async_db() -> AsyncDatabase:
+    """Return the async database of the current application."""
+    return current_app.extensions['async_db']
@@ -3,11 +3,14 @@
 This module handles database setup, initialization, and provides the SQLAlchemy instance
 for the application. It supports database connection and configuration.
 """
-from typing import Any
+import threading
+import time
+from typing import Any, Dict
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import create_engine
-from sqlalchemy_utils import database_exists, create_database
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 import logging
 
 # Configure logger for database operations
@@ -16,6 +19,108 @@ logger = logging.getLogger(__name__)
 # Create a single SQLAlchemy instance to be used across the app
 db = SQLAlchemy()
 
+# Engine options that only apply to a QueuePool
+_QUEUE_POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle')
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outer call
+        depth = getattr(self._local, 'depth', 0)
+        if depth:
+            return super()._do_get()
+
+        self._local.depth = 1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            self._local.depth = 0
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current pool occupancy and checkout wait statistics.
+
+        Returns:
+            dict: Pool counters for this worker process
+        """
+        with self._stats_lock:
+            return {
+                'pool_size': self.size(),
+                'checked_in': self.checkedin(),
+                'checked_out': self.checkedout(),
+                'overflow': self.overflow(),
+                'max_overflow': self._max_overflow,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000, 3)
+            }
+
+
+def configure_engine_options(app: Flask) -> None:
+    """Adapt the configured engine options to the database driver.
+
+    Must run before ``db.init_app``. Server databases get the
+    instrumented queue pool; SQLite uses Flask-SQLAlchemy's own pool
+    choice, which rejects queue pool sizing options.
+    """
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite':
+        for key in _QUEUE_POOL_OPTIONS:
+            options.pop(key, None)
+    else:
+        options.setdefault('poolclass', InstrumentedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection pool statistics of the current application's engine.
+
+    Returns:
+        dict: Pool counters, or just the pool status for non-instrumented pools
+    """
+    pool = db.engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {'status': pool.status()}
+
+
+def dispose_engines_after_fork(app: Flask) -> None:
+    """Drop the connection pools a forked worker inherited from its parent.
+
+    Pooled connections are sockets shared with the parent process;
+    ``close=False`` leaves them open for the parent instead of sending a
+    disconnect on its behalf, and the worker opens its own on demand.
+
+    Args:
+        app (Flask): Application whose engines are reset
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
 def init_db(app: Flask) -> None:
     """Initialize the database connection with the Flask app.
     
@@ -30,6 +135,9 @@ def init_db(app: Flask) -> None:
 
 def _create_database_if_not_exists(database_uri: str) -> None:
     """Create the database if it doesn't exist.
+
+    sqlalchemy-utils opens and disposes its own short-lived engine, so
+    no connection pool outlives this check.
     
     Args:
         database_uri: SQLAlchemy database URI
@@ -37,11 +145,14 @@ def _create_database_if_not_exists(database_uri: str) -> None:
     Raises:
         RuntimeError: If database creation fails
     """
+    # Imported here so fast-startup workers never load sqlalchemy-utils
+    from sqlalchemy_utils import database_exists, create_database
+
     try:
-        engine = create_engine(database_uri)
-        if not database_exists(engine.url):
-            create_database(engine.url)
-            logger.info("Created database: %s", engine.url.database)
+        url = make_url(database_uri)
+        if not database_exists(url):
+            create_database(url)
+            logger.info("Created database: %s", url.database)
     except Exception as e:
         logger.error("Failed to create database: %s", str(e))
-        raise RuntimeError(f"Database creation failed: {str(e)}") from e 
\ No newline at end of file
+        raise RuntimeError(f"Database creation failed: {str(e)}") from e 
@@ -0,0 +1,59 @@
+"""Gunicorn settings for production.
+
+Used by ``python run.py`` outside debug mode, or directly::
+
+    gunicorn -c python:config.gunicorn run:app
+
+The app is loaded once in the master and forked into the workers, so
+anything a worker must not share with its siblings (pooled database
+connections, file locks, thread and process pools) is created, or
+re-created, after the fork.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# One process per core; threads overlap requests waiting on the database,
+# while password hashing runs in each worker's own process pool
+workers = int(os.getenv('WEB_CONCURRENCY', str(multiprocessing.cpu_count())))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+# Hashing processes per worker: by default the cores are split between the
+# workers rather than each worker starting one per core
+password_hash_workers = int(os.getenv(
+    'PASSWORD_HASH_WORKERS', str(max(1, multiprocessing.cpu_count() // workers))
+))
+worker_class = 'gthread'
+preload_app = True
+
+# Recycle workers to bound memory creep; the jitter keeps them from all
+# restarting at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '10000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', str(max_requests // 10)))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+# In-flight requests get this long to finish on reload, recycling or shutdown
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+pidfile = os.getenv('GUNICORN_PIDFILE') or None
+# Worker heartbeats in memory rather than on a possibly slow disk
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def post_fork(server, worker):
+    """Give the new worker its own database connections and hashing pool."""
+    from app.utils.password_hasher import PasswordHasher
+    from config.database import dispose_engines_after_fork
+    flask_app = worker.app.wsgi()
+    dispose_engines_after_fork(flask_app)
+    # The pool is started lazily, so the master never created one
+    flask_app.config['PASSWORD_HASH_WORKERS'] = password_hash_workers
+    flask_app.extensions['password_hasher'] = PasswordHasher.from_config(flask_app.config)
+
+
+def child_exit(server, worker):
+    """Remove the metrics files of a worker that exited."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,43 @@
+"""trigram indexes for user search
+
+Revision ID: 4d2a8c91e6f0
+Revises: 9b1f4e27c3d8
+Create Date: 2025-03-24 18:40:05.113902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d2a8c91e6f0'
+down_revision = '9b1f4e27c3d8'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ('username', 'first_name', 'last_name')
+
+
+def upgrade():
+    # Trigram indexes are PostgreSQL-only; other backends search in memory
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_users_{column}_trgm',
+            'users',
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for column in SEARCH_COLUMNS:
+        op.drop_index(f'ix_users_{column}_trgm', table_name='users')
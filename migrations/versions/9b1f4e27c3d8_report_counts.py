@@ -0,0 +1,49 @@
+"""report created_at and per-day report counts
+
+Revision ID: 9b1f4e27c3d8
+Revises: 32ed19efa596
+Create Date: 2025-03-20 10:12:31.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1f4e27c3d8'
+down_revision = '32ed19efa596'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reports', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()))
+        batch_op.create_index('ix_reports_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    op.create_table('report_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    with op.batch_alter_table('report_counts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_report_counts_day'), ['day'], unique=False)
+
+    # Existing reports all get the migration time as created_at
+    op.execute(
+        "INSERT INTO report_counts (user_id, day, count) "
+        "SELECT user_id, CAST(created_at AS DATE), COUNT(*) FROM reports "
+        "GROUP BY user_id, CAST(created_at AS DATE)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('report_counts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_report_counts_day'))
+
+    op.drop_table('report_counts')
+    with op.batch_alter_table('reports', schema=None) as batch_op:
+        batch_op.drop_index('ix_reports_user_id_created_at')
+        batch_op.drop_column('created_at')
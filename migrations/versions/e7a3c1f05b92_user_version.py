@@ -0,0 +1,26 @@
+"""user version column for optimistic concurrency
+
+Revision ID: e7a3c1f05b92
+Revises: 4d2a8c91e6f0
+Create Date: 2025-03-27 09:41:18.220573
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a3c1f05b92'
+down_revision = '4d2a8c91e6f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('version')
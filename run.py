@@ -1,7 +1,19 @@
-"""Application entry point."""
-from app import create_app
+"""Application entry point.
 
-app = create_app()
+``python run.py`` starts Werkzeug's development server when the
+configuration has ``DEBUG`` set and the gunicorn production server
+(see ``config/gunicorn.py``) otherwise.
+"""
+# Password hashing processes are spawned, and spawned processes import
+# this script again as __mp_main__; they must not build an app of their own
+if __name__ != '__mp_main__':
+    from app import create_app
+
+    app = create_app()
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000) 
\ No newline at end of file
+    if app.config['DEBUG']:
+        app.run(host='0.0.0.0', port=5000)
+    else:
+        from app.server import serve
+        serve(app)
@@ -1,35 +1,114 @@
-"""Test configuration and fixtures."""
+"""Test configuration and fixtures.
+
+The schema is created once per session. Each test then runs inside a
+transaction on a single connection, and every session the app opens
+joins it through a SAVEPOINT, so commits in the code under test only
+release the savepoint and the outer rollback restores the database.
+
+Set ``TEST_DATABASE_URL=sqlite://`` to run against in-memory SQLite
+instead of PostgreSQL; with pytest-xdist (``-n auto``) every worker
+gets its own database.
+"""
 import pytest
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
 from app import create_app
+from app.utils.query_profiler import assert_max_queries
 from config.database import db as _db
 
-@pytest.fixture
-def app():
-    """Create and configure a new app instance for each test.
-    
+
+class _ConnectionSession(Session):
+    """Flask-SQLAlchemy session that honours an explicit ``bind``.
+
+    The stock session always resolves the app's engine, which would
+    bypass the per-test connection.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        return bind if bind is not None else self.bind
+
+
+def _enable_sqlite_savepoints(engine):
+    """Let SQLAlchemy emit BEGIN itself so SAVEPOINT works on pysqlite."""
+    @event.listens_for(engine, 'connect')
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def begin(conn):
+        conn.exec_driver_sql('BEGIN')
+
+    # Drop connections opened before the listeners existed
+    engine.dispose()
+
+@pytest.fixture(scope='session')
+def _app():
+    """Create the application and its schema once per test session.
+
     Returns:
         Flask: Test Flask application
     """
     app = create_app('testing')
-    
-    # Create tables
+
     with app.app_context():
+        if _db.engine.dialect.name == 'sqlite':
+            _enable_sqlite_savepoints(_db.engine)
+        _db.drop_all()
         _db.create_all()
-    
+
     yield app
-    
-    # Clean up
+
     with app.app_context():
         _db.session.remove()
         _db.drop_all()
+        _db.engine.dispose()
+
+@pytest.fixture
+def app(_app):
+    """Run a test inside a transaction that is rolled back afterwards.
+
+    Configuration and extensions replaced by the test are restored, and
+    per-worker caches are emptied so no state leaks between tests.
+
+    Returns:
+        Flask: Test Flask application
+    """
+    with _app.app_context():
+        connection = _db.engine.connect()
+    transaction = connection.begin()
+
+    session = _db.session
+    _db.session = _db._make_scoped_session({
+        'class_': _ConnectionSession,
+        'bind': connection,
+        'join_transaction_mode': 'create_savepoint'
+    })
+    config = dict(_app.config)
+    extensions = dict(_app.extensions)
+
+    yield _app
+
+    _app.config.clear()
+    _app.config.update(config)
+    _app.extensions.clear()
+    _app.extensions.update(extensions)
+    _app.extensions['user_cache'].clear()
+    _app.extensions['user_list_cache'].clear()
+    _app.extensions['user_search_index'].invalidate()
+    _app.extensions['user_name_filter'].invalidate()
+
+    # Sessions were removed as their app contexts were torn down
+    _db.session = session
+    transaction.rollback()
+    connection.close()
 
 @pytest.fixture
 def client(app):
     """Create a test client for the app.
-    
+
     Args:
         app: Flask application
-        
+
     Returns:
         FlaskClient: Test client
     """
@@ -38,12 +117,33 @@ def client(app):
 @pytest.fixture
 def db(app):
     """Create a new database session for a test.
-    
+
     Args:
         app: Flask application
-        
+
     Returns:
         SQLAlchemy: Database instance
     """
     with app.app_context():
-        yield _db 
\ No newline at end of file
+        yield _db
+
+@pytest.fixture
+def max_queries(app):
+    """Assert on the queries issued inside a block.
+
+    Usage: ``with max_queries(3): client.get(...)``. The block fails if
+    it runs more than N statements or repeats a SELECT (N+1).
+
+    Args:
+        app: Flask application
+
+    Returns:
+        callable: Context manager factory taking ``max_queries`` and ``max_repeats``
+    """
+    with app.app_context():
+        engine = _db.engine
+
+    def factory(limit, max_repeats=1):
+        return assert_max_queries(limit, max_repeats, engine=engine)
+
+    return factory
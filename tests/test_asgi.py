@@ -0,0 +1,174 @@
+"""ASGI serving mode tests."""
+import asyncio
+import pytest
+from config.config import TestingConfig, config
+from config.database import db as _db
+
+httpx = pytest.importorskip('httpx')
+pytest.importorskip('aiosqlite')
+
+@pytest.fixture
+def asgi_app(request, tmp_path):
+    """Create an ASGI app on a SQLite file shared by both engines.
+
+    Indirect parametrization passes extra configuration.
+    """
+    from app.asgi import create_asgi_app
+
+    config['asgi-test'] = type('AsgiTestConfig', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "asgi.db"}',
+        **getattr(request, 'param', {})
+    })
+    try:
+        asgi_app = create_asgi_app('asgi-test')
+    finally:
+        del config['asgi-test']
+    with asgi_app.flask_app.app_context():
+        _db.create_all()
+    yield asgi_app
+    with asgi_app.flask_app.app_context():
+        _db.session.remove()
+        _db.engine.dispose()
+    asyncio.run(asgi_app.flask_app.extensions['async_db'].dispose())
+
+def _run(asgi_app, requests):
+    """Send requests concurrently and return the responses in order."""
+    async def send_all():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await asyncio.gather(*(client.request(*args, **kwargs) for args, kwargs in requests))
+    return asyncio.run(send_all())
+
+def test_async_and_sync_routes(asgi_app):
+    """Test async read and report handlers alongside delegated sync routes."""
+    # Creation is served by the Flask app through the WSGI adapter
+    (response,) = _run(asgi_app, [(('POST', '/api/users'), {'json': {
+        'username': 'testuser',
+        'email': 'test@example.com',
+        'password': 'Test123!@#'
+    }})])
+    assert response.status_code == 201
+    user_id = response.json()['user']['id']
+    
+    responses = _run(asgi_app, [
+        (('GET', f'/api/users/{user_id}'), {}),
+        (('GET', '/api/users/999'), {}),
+        (('GET', '/api/users?limit=1'), {}),
+        (('POST', '/api/users/report'), {'json': {'reporter_id': 1, 'target_id': user_id, 'reason': 'spam'}}),
+        (('POST', '/api/users/report'), {'json': {'reporter_id': 1}})
+    ])
+    assert [r.status_code for r in responses] == [200, 404, 200, 201, 400]
+    assert responses[0].json()['user']['username'] == 'testuser'
+    assert responses[2].json()['users'][0]['id'] == user_id
+    
+    (response,) = _run(asgi_app, [(('GET', '/api/users/reports/top?days=1'), {})])
+    assert response.json()['users'][0]['report_count'] == 1
+
+def test_async_report_rate_limited(asgi_app):
+    """Test that natively served reports are throttled like the Flask route."""
+    from flask_jwt_extended import create_access_token
+    from app.utils.rate_limit import RateLimiter, TokenBuckets
+
+    flask_app = asgi_app.flask_app
+    flask_app.config['RATE_LIMIT_ENABLED'] = True
+    flask_app.extensions['rate_limiter'] = RateLimiter(
+        {'user.report_user': {'identity': (1, 0.01)}}, TokenBuckets()
+    )
+    with flask_app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    responses = _run(asgi_app, [(('POST', '/api/users/report'), {'json': {}, 'headers': headers})] * 2)
+    assert sorted(r.status_code for r in responses) == [400, 429]
+    throttled = next(r for r in responses if r.status_code == 429)
+    assert throttled.headers['Retry-After'] == '100'
+
+    # Requests without a token have no identity bucket
+    (response,) = _run(asgi_app, [(('POST', '/api/users/report'), {'json': {}})])
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('asgi_app', [{'PROXY_FIX_HOPS': 1}], indirect=True)
+def test_proxy_client_address(asgi_app):
+    """Test that both paths key rate limits by the address the proxy forwarded."""
+    from app.utils.rate_limit import RateLimiter, TokenBuckets
+
+    flask_app = asgi_app.flask_app
+    flask_app.config['RATE_LIMIT_ENABLED'] = True
+    flask_app.extensions['rate_limiter'] = RateLimiter(
+        {'user.get_user': {'ip': (1, 0.01)}, 'user.check_availability': {'ip': (1, 0.01)}},
+        TokenBuckets()
+    )
+    # Served natively, then through the Flask app
+    for path, status in (('/api/users/1', 404), ('/api/users/availability?username=free', 200)):
+        codes = [
+            _run(asgi_app, [(('GET', path), {'headers': {'X-Forwarded-For': client}})])[0].status_code
+            for client in ('10.0.0.1', '10.0.0.1', '10.0.0.2')
+        ]
+        assert codes == [status, 429, status]
+
+def test_delegated_requests_run_concurrently(asgi_app):
+    """Test that routes served by the Flask app do not queue behind each other."""
+    import threading
+    barrier = threading.Barrier(4, timeout=5)
+
+    def wait_for_all():
+        # Passes only once four requests are inside the view at the same time
+        barrier.wait()
+        return {'thread': threading.current_thread().name}, 200
+    asgi_app.flask_app.add_url_rule('/test/barrier', 'barrier', wait_for_all)
+
+    responses = _run(asgi_app, [(('GET', '/test/barrier'), {})] * 4)
+    assert [r.status_code for r in responses] == [200] * 4
+    assert len({r.json()['thread'] for r in responses}) == 4
+
+def test_async_reads_conditional_cached_and_compressed(asgi_app):
+    """Test that native reads answer like the Flask views they replace."""
+    flask_app = asgi_app.flask_app
+    (response,) = _run(asgi_app, [(('POST', '/api/users'), {'json': {
+        'username': 'testuser',
+        'email': 'test@example.com',
+        'password': 'Test123!@#'
+    }})])
+    user_id = response.json()['user']['id']
+    
+    # A user carries its ETag, revalidates with 304 and feeds If-Match
+    (response,) = _run(asgi_app, [(('GET', f'/api/users/{user_id}'), {})])
+    etag = response.headers['ETag']
+    assert etag == f'"{user_id}-v1"'
+    (response,) = _run(asgi_app, [(('GET', f'/api/users/{user_id}'), {'headers': {'If-None-Match': etag}})])
+    assert response.status_code == 304
+    (response,) = _run(asgi_app, [(('PUT', f'/api/users/{user_id}'), {
+        'json': {'first_name': 'Test'}, 'headers': {'If-Match': etag}
+    })])
+    assert response.status_code == 200
+    
+    # Pages come from the shared list cache with ETag and Cache-Control
+    responses = _run(asgi_app, [(('GET', '/api/users'), {})])
+    responses += _run(asgi_app, [(('GET', '/api/users'), {})])
+    assert [r.status_code for r in responses] == [200, 200]
+    assert responses[0].headers['ETag'] == responses[1].headers['ETag']
+    assert responses[0].headers['Cache-Control'] == 'public, max-age=5'
+    assert flask_app.extensions['user_list_cache'].stats()['hits'] == 1
+    (response,) = _run(asgi_app, [(('GET', '/api/users'), {
+        'headers': {'If-None-Match': responses[0].headers['ETag']}
+    })])
+    assert response.status_code == 304
+    
+    # Responses go through the app's compression hook
+    flask_app.config['COMPRESS_MIN_SIZE'] = 10
+    (response,) = _run(asgi_app, [(('GET', '/api/users'), {'headers': {'Accept-Encoding': 'gzip'}})])
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.json()['users'][0]['first_name'] == 'Test'
+
+def test_async_reads_recorded_in_metrics(asgi_app):
+    """Test that native views get request and database metrics."""
+    from prometheus_client import REGISTRY
+    endpoint = '/api/users/<int:user_id>'
+    def sample(name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+    requests_before = sample('http_requests_total', method='GET', endpoint=endpoint, status='404')
+    queries_before = sample('http_request_db_queries_sum', endpoint=endpoint)
+
+    (response,) = _run(asgi_app, [(('GET', '/api/users/12345'), {})])
+    assert response.status_code == 404
+    assert sample('http_requests_total', method='GET', endpoint=endpoint, status='404') == requests_before + 1
+    assert sample('http_request_db_queries_sum', endpoint=endpoint) >= queries_before + 1
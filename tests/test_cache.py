@@ -0,0 +1,143 @@
+"""Cache tests."""
+import os
+from app.services.user_cache import UserCache
+from app.utils.bloom import BloomFilter
+from app.utils.cache import LRUTTLCache
+from app.utils.generation import GenerationCounter
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted."""
+    cache = LRUTTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 3
+    assert stats['misses'] == 1
+
+def test_ttl_expiry():
+    """Test that entries expire after the TTL."""
+    now = [0.0]
+    cache = LRUTTLCache(maxsize=10, ttl=5, clock=lambda: now[0])
+    cache.set('a', 1)
+    now[0] = 4.9
+    assert cache.get('a') == 1
+    now[0] = 5.0
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+def test_generation_counter_shared_file(tmp_path):
+    """Test that counters on the same file see each other's bumps."""
+    path = str(tmp_path / 'generation')
+    first = GenerationCounter(path)
+    second = GenerationCounter(path)
+    assert first.value() == second.value() == 0
+    
+    assert first.bump() == 1
+    assert second.value() == 1
+    assert second.bump() == 2
+    assert first.value() == 2
+    
+    local = GenerationCounter()
+    assert local.bump() == 1
+    assert first.value() == 2
+
+def test_user_cache_generation(tmp_path):
+    """Test that cached users are dropped by any worker's write."""
+    path = str(tmp_path / 'generation')
+    first = UserCache(10, 60, GenerationCounter(path))
+    second = UserCache(10, 60, GenerationCounter(path))
+    user = {'id': 1, 'username': 'testuser', 'version': 1}
+    generation = first.generation.value()
+    first.put(generation, user)
+    assert first.get_by_id(1) == first.get_by_username('testuser') == user
+    
+    second.generation.bump()
+    assert first.get_by_id(1) is None
+    assert first.get_by_username('testuser') is None
+    
+    # A row read before a concurrent write is never served
+    first.put(generation, user)
+    assert first.get_by_id(1) is None
+
+def test_bloom_filter():
+    """Test that added keys are always found and misses are mostly exact."""
+    bloom = BloomFilter(1000, error_rate=0.01)
+    bloom.update(f'user{i}' for i in range(1000))
+    assert all(f'user{i}' in bloom for i in range(1000))
+    assert not bloom.saturated
+    
+    false_positives = sum(f'other{i}' in bloom for i in range(10000))
+    assert false_positives < 300
+    
+    bloom.add('one more')
+    assert bloom.saturated
+
+def test_generation_counter_after_fork(tmp_path):
+    """Test that forked processes lock the shared counter against each other."""
+    counter = GenerationCounter(str(tmp_path / 'generation'))
+    counter.bump()
+    pid = os.fork()
+    if pid == 0:
+        for _ in range(20000):
+            counter.bump()
+        os._exit(0)
+    for _ in range(20000):
+        counter.bump()
+    os.waitpid(pid, 0)
+    assert counter.value() == 40001
+
+def test_generation_counter_threads_after_fork(tmp_path, monkeypatch):
+    """Test that threads of forked workers each share one reopened file."""
+    import mmap
+    import threading
+    import time
+    counter = GenerationCounter(str(tmp_path / 'generation'))
+    counter.bump()
+
+    # Widen the window in which threads race to reopen the file
+    real_mmap, opened = mmap.mmap, []
+    def slow_mmap(*args):
+        opened.append(args)
+        time.sleep(0.01)
+        return real_mmap(*args)
+    monkeypatch.setattr(mmap, 'mmap', slow_mmap)
+
+    def run_threads():
+        errors = []
+        barrier = threading.Barrier(8)
+
+        def work():
+            try:
+                barrier.wait()
+                for _ in range(100):
+                    counter.value()
+                    counter.bump()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # One mapping per process, never replaced under a running thread
+        return not errors and len(opened) == 1
+
+    for _ in range(4):
+        pid = os.fork()
+        if pid == 0:
+            ok = False
+            try:
+                ok = run_threads()
+            finally:
+                os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+    assert counter.value() == 1 + 4 * 800
@@ -0,0 +1,53 @@
+"""Database configuration tests."""
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, exc
+from config.database import InstrumentedQueuePool, configure_engine_options
+
+def test_pool_stats(tmp_path):
+    """Test checkout counters and timeouts of the instrumented pool."""
+    engine = create_engine(
+        f'sqlite:///{tmp_path / "pool.db"}',
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05
+    )
+    try:
+        conn = engine.connect()
+        stats = engine.pool.stats()
+        assert stats['checked_out'] == 1
+        assert stats['checkouts'] == 1
+        
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        stats = engine.pool.stats()
+        assert stats['timeouts'] == 1
+        assert stats['wait_max_ms'] >= 50
+        
+        conn.close()
+        assert engine.pool.stats()['checked_out'] == 0
+    finally:
+        engine.dispose()
+
+def test_configure_engine_options():
+    """Test pool options for server and SQLite databases."""
+    options = {'pool_size': 3, 'max_overflow': 2, 'pool_pre_ping': True}
+    
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'postgresql://localhost/db'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    configure_engine_options(app)
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS']['poolclass'] is InstrumentedQueuePool
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'] == 3
+    
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    configure_engine_options(app)
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS'] == {'pool_pre_ping': True}
+
+def test_pool_stats_endpoint(client):
+    """Test the pool metrics endpoint."""
+    response = client.get('/health/db-pool')
+    assert response.status_code == 200
+    assert 'pool' in response.get_json()
@@ -0,0 +1,42 @@
+"""Prometheus metrics tests."""
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+def _sample(name, **labels):
+    """Read a sample from the default registry, 0 if it does not exist yet."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_request_metrics(client):
+    """Test latency, status and DB query metrics per endpoint."""
+    endpoint = '/api/users/<int:user_id>'
+    requests_before = _sample('http_requests_total', method='GET', endpoint=endpoint, status='404')
+    queries_before = _sample('http_request_db_queries_sum', endpoint=endpoint)
+
+    response = client.get('/api/users/12345')
+    assert response.status_code == 404
+
+    assert _sample('http_requests_total', method='GET', endpoint=endpoint, status='404') == requests_before + 1
+    assert _sample('http_request_db_queries_sum', endpoint=endpoint) >= queries_before + 1
+    assert _sample('http_request_duration_seconds_count', method='GET', endpoint=endpoint) >= 1
+    assert _sample('http_requests_in_flight') == 0
+
+def test_metrics_endpoint(client):
+    """Test the Prometheus text exposition and unmatched URL labelling."""
+    client.get('/no/such/path')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert 'http_request_duration_seconds_bucket' in body
+    assert 'endpoint="unmatched"' in body
+    assert 'endpoint="/metrics"' not in body
+
+def test_failed_query_start_discarded(app, db):
+    """Test that a failing statement leaves no start time on its connection."""
+    with app.test_request_context():
+        connection = db.session.connection()
+        with pytest.raises(Exception):
+            db.session.execute(text('SELECT * FROM no_such_table'))
+        assert not connection.info.get('query_start')
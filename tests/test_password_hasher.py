@@ -0,0 +1,65 @@
+"""Password hasher tests."""
+import os
+import runpy
+from types import SimpleNamespace
+import pytest
+from app.utils.password_hasher import HashingBusyError, PasswordHasher
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_process_pool_round_trip():
+    """Test hashing and verification on worker processes."""
+    hasher = PasswordHasher(workers=1, queue_depth=1)
+    try:
+        password_hash = hasher.hash('Test123!@#')
+        assert hasher.verify(password_hash, 'Test123!@#')
+        assert not hasher.verify(password_hash, 'wrong')
+        
+        hashes = hasher.hash_many(['Test123!@#', 'Other123!@#'])
+        assert hasher.verify(hashes[1], 'Other123!@#')
+    finally:
+        hasher.shutdown()
+
+def test_queue_full():
+    """Test that requests beyond the queue depth are rejected."""
+    hasher = PasswordHasher(workers=0, queue_depth=0, retry_after=5)
+    hasher._slots.acquire()
+    with pytest.raises(HashingBusyError) as exc_info:
+        hasher.hash('Test123!@#')
+    assert exc_info.value.retry_after == 5
+    with pytest.raises(HashingBusyError):
+        hasher.hash_many(['Test123!@#'])
+
+def test_batch_slots():
+    """Test that a batch holds at most half the workers' slots and releases them."""
+    hasher = PasswordHasher(workers=2, queue_depth=0)
+    try:
+        hashes = hasher.hash_many([f'Test{i}!@#aA' for i in range(4)])
+        assert hasher.verify(hashes[3], 'Test3!@#aA')
+        assert hasher._acquire_up_to(3) == 2
+        
+        # With every slot taken the batch is rejected up front
+        with pytest.raises(HashingBusyError):
+            hasher.hash_many(['Test123!@#'])
+        hasher._slots.release()
+        
+        # The remaining slot is enough to run a batch one hash at a time
+        assert len(hasher.hash_many(['Test123!@#', 'Other123!@#'])) == 2
+    finally:
+        hasher.shutdown()
+
+def test_spawned_workers_skip_app_creation():
+    """Test that hashing processes re-importing run.py do not create an app."""
+    namespace = runpy.run_path(os.path.join(PROJECT_ROOT, 'run.py'), run_name='__mp_main__')
+    assert 'app' not in namespace
+
+def test_gunicorn_workers_split_hashing_processes(app, monkeypatch):
+    """Test that each forked gunicorn worker gets its share of hashing processes."""
+    from config import gunicorn
+    assert gunicorn.password_hash_workers >= 1
+    # Disposing the engines would drop the in-memory test database
+    monkeypatch.setattr('config.database.dispose_engines_after_fork', lambda flask_app: None)
+
+    worker = SimpleNamespace(app=SimpleNamespace(wsgi=lambda: app))
+    gunicorn.post_fork(None, worker)
+    assert app.extensions['password_hasher'].workers == gunicorn.password_hash_workers
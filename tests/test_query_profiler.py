@@ -0,0 +1,53 @@
+"""Query profiler tests."""
+import logging
+import pytest
+from sqlalchemy import create_engine, text
+from app.utils.query_profiler import SlowQueryLogger, assert_max_queries, normalize_sql
+
+def test_normalize_sql():
+    """Test that statements differing only in parameters normalize alike."""
+    assert normalize_sql("SELECT * FROM users\n WHERE id = 42 AND name = 'o''neil'") == \
+        'SELECT * FROM users WHERE id = ? AND name = ?'
+    assert normalize_sql('SELECT * FROM users WHERE id IN (%(id_1)s, %(id_2)s)') == \
+        normalize_sql('SELECT * FROM users WHERE id IN (?)')
+    assert normalize_sql('INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)') == 'INSERT INTO t (a, b) VALUES (?)'
+    assert normalize_sql('SELECT CAST(x AS TEXT)::text FROM users_1') == 'SELECT CAST(x AS TEXT)::text FROM users_1'
+
+def test_slow_query_log(caplog):
+    """Test that only statements over the threshold are logged."""
+    engine = create_engine('sqlite://')
+    SlowQueryLogger(0).attach(engine)
+    with caplog.at_level(logging.WARNING, logger='app.sql.slow'):
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+    assert any('SELECT ?' in record.getMessage() for record in caplog.records)
+    
+    engine = create_engine('sqlite://')
+    SlowQueryLogger(10_000).attach(engine)
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger='app.sql.slow'):
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+            with pytest.raises(Exception):
+                conn.execute(text('SELECT * FROM no_such_table'))
+            # A failed statement leaves no start time behind
+            assert not conn.info['query_start']
+    assert not caplog.records
+
+def test_assert_max_queries():
+    """Test the query count and N+1 assertions."""
+    engine = create_engine('sqlite://')
+    with engine.connect() as conn:
+        with assert_max_queries(2, engine=engine) as counter:
+            conn.execute(text('SELECT 1'))
+        assert counter.count == 1
+        
+        with pytest.raises(AssertionError, match='expected at most 1'):
+            with assert_max_queries(1, max_repeats=5, engine=engine):
+                conn.execute(text('SELECT 1'))
+                conn.execute(text('SELECT 2'))
+        
+        with pytest.raises(AssertionError, match='N\\+1'):
+            with assert_max_queries(10, engine=engine):
+                for i in range(3):
+                    conn.execute(text('SELECT :id'), {'id': i})
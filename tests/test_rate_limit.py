@@ -0,0 +1,97 @@
+"""Rate limiting tests."""
+import json
+from flask_jwt_extended import create_access_token
+from app.utils.rate_limit import RateLimiter, SharedTokenBuckets, TokenBuckets, parse_limit
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_token_buckets_refill():
+    """Test that a bucket allows a burst, then refills at its rate."""
+    clock = _Clock()
+    buckets = TokenBuckets(clock=clock)
+    capacity, rate = parse_limit('2/10')
+    assert buckets.consume('key', capacity, rate) == 0
+    assert buckets.consume('key', capacity, rate) == 0
+    assert buckets.consume('key', capacity, rate) == 5
+    assert buckets.consume('other', capacity, rate) == 0
+
+    clock.now += 5
+    assert buckets.consume('key', capacity, rate) == 0
+    assert buckets.consume('key', capacity, rate) > 0
+
+    assert parse_limit('') is None
+
+def test_rate_limiter_stops_at_exhausted_bucket():
+    """Test that a throttled request takes no token from later buckets."""
+    limiter = RateLimiter({'endpoint': {'ip': (1, 0.01), 'username': (2, 0.01)}}, TokenBuckets())
+    assert limiter.check('endpoint', {'ip': 'a', 'username': 'user'}) == 0
+    assert limiter.check('endpoint', {'ip': 'a', 'username': 'user'}) > 0
+    # The username bucket still has its second token
+    assert limiter.check('endpoint', {'ip': 'b', 'username': 'user'}) == 0
+    assert limiter.check('endpoint', {'ip': 'c', 'username': 'user'}) > 0
+
+def test_shared_token_buckets(tmp_path):
+    """Test that stores on the same file share their buckets."""
+    clock = _Clock()
+    path = str(tmp_path / 'buckets')
+    first = SharedTokenBuckets(path, slots=16, clock=clock)
+    second = SharedTokenBuckets(path, slots=16, clock=clock)
+    assert first.consume('key', 2, 0.1) == 0
+    assert second.consume('key', 2, 0.1) == 0
+    assert first.consume('key', 2, 0.1) == 10
+
+    # More keys than slots reuse the stalest ones
+    for i in range(40):
+        clock.now += 1
+        assert second.consume(f'key{i}', 1, 0.1) == 0
+
+def test_login_rate_limited(app, client, max_queries):
+    """Test that throttled logins get a 429 without touching the database."""
+    app.config['RATE_LIMIT_ENABLED'] = True
+    app.extensions['rate_limiter'] = RateLimiter(
+        {'user.login': {'username': (2, 0.01)}}, TokenBuckets()
+    )
+    credentials = {'username': 'testuser', 'password': 'Test123!@#'}
+    for _ in range(2):
+        assert client.post('/api/users/login', json=credentials).status_code == 401
+
+    with max_queries(0):
+        response = client.post('/api/users/login', json=credentials)
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '100'
+    assert json.loads(response.data)['message'] == 'Too many requests'
+
+    # Buckets are per username
+    response = client.post('/api/users/login', json={'username': 'other', 'password': 'x'})
+    assert response.status_code == 401
+
+def test_availability_rate_limited(app, client):
+    """Test that availability checks are limited per client IP."""
+    limiter = RateLimiter.from_config(app.config)
+    assert set(limiter.limits['user.check_availability']) == {'ip'}
+
+    app.config['RATE_LIMIT_ENABLED'] = True
+    limiter.limits['user.check_availability'] = {'ip': (1, 0.01)}
+    app.extensions['rate_limiter'] = limiter
+    assert client.get('/api/users/availability?username=free').status_code == 200
+    assert client.get('/api/users/availability?username=free').status_code == 429
+
+def test_report_rate_limited_by_identity(app, client):
+    """Test that reports are limited per JWT identity."""
+    app.config['RATE_LIMIT_ENABLED'] = True
+    app.extensions['rate_limiter'] = RateLimiter(
+        {'user.report_user': {'identity': (1, 0.01)}}, TokenBuckets()
+    )
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    assert client.post('/api/users/report', json={}, headers=headers).status_code == 400
+    assert client.post('/api/users/report', json={}, headers=headers).status_code == 429
+
+    # Requests without a token have no identity bucket
+    assert client.post('/api/users/report', json={}).status_code == 400
@@ -0,0 +1,140 @@
+"""Report tests."""
+import json
+import time
+from datetime import datetime
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.models.report import Report, ReportCount
+from app.models.user import User
+from app.services.report_queue import ReportQueue
+
+def _create_user(db):
+    user = User(
+        username='target',
+        email='target@example.com',
+        password='Test123!@#'
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+def test_report_user_sync(client, db):
+    """Test that a report is committed before the response."""
+    user_id = _create_user(db)
+    response = client.post(
+        '/api/users/report',
+        json={'reporter_id': 1, 'target_id': user_id, 'reason': 'spam'}
+    )
+    assert response.status_code == 201
+    assert Report.query.filter_by(user_id=user_id).count() == 1
+
+def test_report_user_async(app, client, db):
+    """Test that async reports are accepted and flushed in a batch."""
+    user_id = _create_user(db)
+    app.config['REPORT_DURABILITY'] = 'async'
+    report_queue = ReportQueue(app, batch_size=100, flush_interval=60, max_pending=2)
+    app.extensions['report_queue'] = report_queue
+    try:
+        for reason in ('spam', 'abuse'):
+            response = client.post(
+                '/api/users/report',
+                json={'reporter_id': 1, 'target_id': user_id, 'reason': reason}
+            )
+            assert response.status_code == 202
+        
+        # Queue is full
+        response = client.post(
+            '/api/users/report',
+            json={'reporter_id': 1, 'target_id': user_id, 'reason': 'more'}
+        )
+        assert response.status_code == 503
+        assert Report.query.count() == 0
+        
+        assert report_queue.flush() == 2
+        assert Report.query.filter_by(user_id=user_id).count() == 2
+    finally:
+        report_queue.shutdown()
+
+def test_report_queue_drops_invalid_rows(app, db):
+    """Test that one bad row does not discard the rest of its batch."""
+    user_id = _create_user(db)
+    report_queue = ReportQueue(app, batch_size=100, flush_interval=60, max_pending=10)
+    now = datetime.utcnow()
+    report_queue.submit({'user_id': user_id, 'reason': 'spam', 'created_at': now})
+    report_queue.submit({'user_id': user_id, 'reason': None, 'created_at': now})
+    report_queue.submit({'user_id': user_id, 'reason': 'abuse', 'created_at': now})
+    report_queue.shutdown()
+    
+    reasons = sorted(r.reason for r in Report.query.filter_by(user_id=user_id))
+    assert reasons == ['abuse', 'spam']
+    assert db.session.query(ReportCount).filter_by(user_id=user_id).one().count == 2
+
+def test_report_queue_retries_database_errors(app, db, monkeypatch):
+    """Test that a batch failing on a database outage is retried, not dropped."""
+    from app.services import report_queue as report_queue_module
+    user_id = _create_user(db)
+    write_reports = report_queue_module.write_reports
+    failures = [OperationalError('INSERT', {}, Exception('database is down'))] * 2
+    def flaky_write_reports(rows):
+        if failures:
+            raise failures.pop()
+        write_reports(rows)
+    monkeypatch.setattr(report_queue_module, 'write_reports', flaky_write_reports)
+    
+    report_queue = ReportQueue(app, batch_size=2, flush_interval=60, max_pending=10, retry_delay=0.01)
+    now = datetime.utcnow()
+    report_queue.submit({'user_id': user_id, 'reason': 'spam', 'created_at': now})
+    report_queue.submit({'user_id': user_id, 'reason': 'abuse', 'created_at': now})
+    
+    # The background thread survives both failures and writes the batch
+    deadline = time.monotonic() + 5
+    while report_queue.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    thread = report_queue._thread
+    assert report_queue.pending() == 0 and not failures
+    assert thread.is_alive()
+    
+    # A failed flush keeps the reports queued
+    failures.append(OperationalError('INSERT', {}, Exception('database is down')))
+    report_queue.submit({'user_id': user_id, 'reason': 'more', 'created_at': now})
+    with pytest.raises(OperationalError):
+        report_queue.flush()
+    assert report_queue.pending() == 1
+    report_queue.shutdown()
+    
+    db.session.expire_all()
+    assert Report.query.filter_by(user_id=user_id).count() == 3
+
+def test_most_reported_users(app, client, db):
+    """Test the top reported users endpoint and its counters."""
+    users = []
+    for name in ('alice', 'bob', 'carol'):
+        user = User(username=name, email=f'{name}@example.com', password='Test123!@#')
+        db.session.add(user)
+        users.append(user)
+    db.session.commit()
+    alice, bob, carol = (u.id for u in users)
+    
+    for target_id in (bob, bob, bob, alice, carol, carol):
+        response = client.post(
+            '/api/users/report',
+            json={'reporter_id': 1, 'target_id': target_id, 'reason': 'spam'}
+        )
+        assert response.status_code == 201
+    
+    # Batched reports update the same counters
+    report_queue = ReportQueue(app, batch_size=100, flush_interval=60, max_pending=10)
+    app.extensions['report_queue'] = report_queue
+    app.config['REPORT_DURABILITY'] = 'async'
+    client.post('/api/users/report', json={'reporter_id': 1, 'target_id': alice, 'reason': 'spam'})
+    client.post('/api/users/report', json={'reporter_id': 1, 'target_id': alice, 'reason': 'spam'})
+    report_queue.shutdown()
+    
+    assert db.session.query(ReportCount).filter_by(user_id=bob).one().count == 3
+    
+    response = client.get('/api/users/reports/top?limit=2&days=1')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [(u['username'], u['report_count']) for u in data['users']] == [('alice', 3), ('bob', 3)]
+    
+    assert client.get('/api/users/reports/top?days=0').status_code == 400
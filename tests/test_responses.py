@@ -0,0 +1,83 @@
+"""JSON provider and response compression tests."""
+import gzip
+import json
+from datetime import datetime
+import pytest
+from app.models.user import User
+from app.schemas.user_schema import user_schema
+from app.utils.json_provider import FastJSONProvider
+
+def test_json_provider_matches_schema_dates(app):
+    """Test that datetimes encode like UserSchema and payloads round-trip."""
+    provider = FastJSONProvider(app)
+    moment = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    user = User(username='user', email='user@example.com', password_hash='x')
+    user.created_at = user.updated_at = moment
+
+    encoded = provider.dumps({'at': moment, 'on': moment.date(), 1: 'x'})
+    assert provider.loads(encoded) == {'at': user_schema.dump(user)['created_at'], 'on': '2024-01-01', '1': 'x'}
+
+    # Options orjson does not support fall back to the stdlib encoder
+    assert provider.loads(provider.dumps({'at': moment}, ensure_ascii=True)) == {'at': moment.isoformat()}
+
+    response = provider.response({'name': 'café'})
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == {'name': 'café'}
+
+def test_list_response_compression(client, db):
+    """Test negotiated compression of large responses."""
+    db.session.add_all([
+        User(username=f'user{i}', email=f'user{i}@example.com', password_hash='x')
+        for i in range(30)
+    ])
+    db.session.commit()
+
+    plain = client.get('/api/users')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['Vary'] == 'Accept-Encoding'
+
+    response = client.get('/api/users', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'] == plain.headers['ETag'][:-1] + '-gz"'
+    assert gzip.decompress(response.data) == plain.data
+    assert len(response.data) < len(plain.data)
+
+    brotli = pytest.importorskip('brotli')
+    response = client.get('/api/users', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == plain.data
+
+    assert response.headers['ETag'] == plain.headers['ETag'][:-1] + '-br"'
+
+    # The encoded tag still revalidates the page and is sent back as is
+    etag = response.headers['ETag']
+    response = client.get('/api/users', headers={'Accept-Encoding': 'br', 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+
+def test_small_responses_not_compressed(client):
+    """Test that bodies under the size threshold are sent as is."""
+    response = client.get('/health', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+def test_compressed_etag_satisfies_if_match(app, client, db):
+    """Test that the ETag of a compressed user still works in If-Match."""
+    app.config['COMPRESS_MIN_SIZE'] = 10
+    user = User(username='user', email='user@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    
+    response = client.get(f'/api/users/{user.id}', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    etag = response.headers['ETag']
+    assert etag.endswith('-gz"')
+    
+    response = client.put(f'/api/users/{user.id}', json={'first_name': 'New'}, headers={'If-Match': etag})
+    assert response.status_code == 200
+    response = client.put(f'/api/users/{user.id}', json={'first_name': 'Newer'}, headers={'If-Match': etag})
+    assert response.status_code == 412
+
+    # If-Match uses strong comparison, so weak tags never match
+    version = client.get(f'/api/users/{user.id}').headers['ETag']
+    response = client.put(f'/api/users/{user.id}', json={'first_name': 'Newest'}, headers={'If-Match': 'W/' + version})
+    assert response.status_code == 412
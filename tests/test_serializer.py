@@ -0,0 +1,53 @@
+"""Compiled serializer tests."""
+from datetime import datetime
+from marshmallow import Schema, fields
+from app.models.user import User
+from app.schemas.fast_serializer import CompiledSerializer
+from app.schemas.user_schema import user_schema, users_schema, user_serializer, users_serializer
+
+def _make_user(i, **overrides):
+    user = User(
+        username=f'user{i}',
+        email=f'user{i}@example.com',
+        password_hash='hash',
+        first_name=overrides.get('first_name', 'First'),
+        country=overrides.get('country')
+    )
+    user.id = i
+    user.created_at = overrides.get('created_at', datetime(2024, 1, 2, 3, 4, 5, 678901))
+    user.updated_at = overrides.get('updated_at', datetime(2024, 1, 2, 3, 4, 5))
+    user.is_active = overrides.get('is_active', True)
+    return user
+
+def test_matches_user_schema():
+    """Test that compiled output equals marshmallow output."""
+    users = [
+        _make_user(1),
+        _make_user(2, first_name=None, created_at=None, is_active=None),
+        _make_user(3, country='NL', is_active=False)
+    ]
+    for user in users:
+        assert user_serializer.dump(user) == user_schema.dump(user)
+        assert list(user_serializer.dump(user)) == list(user_schema.dump(user))
+        assert user.to_dict() == user_schema.dump(user)
+    assert users_serializer.dump(users) == users_schema.dump(users)
+
+def test_non_default_fields_fall_back():
+    """Test fields without an inline fast path."""
+    class OddSchema(Schema):
+        id = fields.Int(as_string=True, data_key='identifier')
+        name = fields.Str(attribute='username')
+        score = fields.Float()
+        flag = fields.Bool()
+        when = fields.DateTime(format='%Y')
+
+    class Obj:
+        id = 7
+        username = 'odd'
+        score = 1
+        flag = 'yes'
+        when = datetime(2024, 5, 6)
+
+    schema = OddSchema()
+    assert CompiledSerializer(schema).dump(Obj()) == schema.dump(Obj())
+    assert CompiledSerializer(schema).dump({'id': 1}) == schema.dump({'id': 1})
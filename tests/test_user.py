@@ -1,7 +1,16 @@
 """User tests."""
 import json
+from datetime import datetime
 import pytest
+from sqlalchemy import update
+from app.models.report import Report, ReportCount
 from app.models.user import User
+from app.services.user_names import UserNameFilter
+from app.services.user_purge import purge_deactivated_users
+from app.services.user_service import UserService
+from app.utils.generation import GenerationCounter
+from app.utils.pagination import encode_cursor
+from app.utils.password_hasher import PasswordHasher
 
 def test_create_user(client):
     """Test user creation."""
@@ -96,6 +105,193 @@ def test_update_user(client, db):
     )
     assert response.status_code == 400
 
+def test_update_user_if_match(client, db, max_queries):
+    """Test optimistic concurrency with ETag and If-Match."""
+    user = User(
+        username='testuser',
+        email='test@example.com',
+        password='Test123!@#'
+    )
+    db.session.add(user)
+    db.session.commit()
+    
+    response = client.get(f'/api/users/{user.id}')
+    etag = response.headers['ETag']
+    assert etag == f'"{user.id}-v1"'
+    assert json.loads(response.data)['user']['version'] == 1
+    
+    # One UPDATE ... RETURNING, no SELECT before or after
+    with max_queries(1) as counter:
+        response = client.put(f'/api/users/{user.id}', json={'first_name': 'First'},
+                              headers={'If-Match': etag})
+    assert counter.statements[0].startswith('UPDATE users')
+    assert response.status_code == 200
+    assert response.headers['ETag'] == f'"{user.id}-v2"'
+    assert json.loads(response.data)['user']['version'] == 2
+    
+    # The stale ETag no longer matches
+    response = client.put(f'/api/users/{user.id}', json={'first_name': 'Lost'},
+                          headers={'If-Match': etag})
+    assert response.status_code == 412
+    assert json.loads(client.get(f'/api/users/{user.id}').data)['user']['first_name'] == 'First'
+    
+    # Tags of other users never match; "*" and no header are unconditional
+    response = client.put(f'/api/users/{user.id}', json={'first_name': 'Other'},
+                          headers={'If-Match': '"999-v2"'})
+    assert response.status_code == 412
+    response = client.put(f'/api/users/{user.id}', json={'first_name': 'Any'},
+                          headers={'If-Match': '*'})
+    assert response.status_code == 200
+    assert client.put('/api/users/999999', json={'first_name': 'X'},
+                      headers={'If-Match': '"999999-v1"'}).status_code == 404
+
+def test_conditional_get(client, db, max_queries):
+    """Test If-None-Match revalidation of a user and of a page of users."""
+    users = [
+        User(username=f'user{i}', email=f'user{i}@example.com', password='Test123!@#')
+        for i in range(3)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    user_id = users[0].id
+    
+    response = client.get(f'/api/users/{user_id}')
+    etag = response.headers['ETag']
+    with max_queries(1):
+        response = client.get(f'/api/users/{user_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    
+    page = client.get('/api/users?limit=2')
+    page_etag = page.headers['ETag']
+    # Without a cached page, revalidation selects only IDs and versions
+    client.application.extensions['user_list_cache'].clear()
+    with max_queries(1) as counter:
+        response = client.get('/api/users?limit=2', headers={'If-None-Match': page_etag})
+    assert response.status_code == 304
+    assert counter.statements[0].startswith('SELECT users.id, users.version FROM')
+    
+    # A change to a user on the page changes both tags
+    client.put(f'/api/users/{user_id}', json={'first_name': 'Changed'})
+    response = client.get(f'/api/users/{user_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert json.loads(response.data)['user']['first_name'] == 'Changed'
+    response = client.get('/api/users?limit=2', headers={'If-None-Match': page_etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != page_etag
+    
+    assert client.get('/api/users/999999', headers={'If-None-Match': etag}).status_code == 404
+
+def test_user_list_cache(client, db, max_queries):
+    """Test that list pages are cached until the next user write."""
+    users = [
+        User(username=f'user{i}', email=f'user{i}@example.com', password='Test123!@#')
+        for i in range(3)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    
+    first = client.get('/api/users?limit=2')
+    assert first.headers['Cache-Control'] == 'public, max-age=5'
+    with max_queries(0):
+        cached = client.get('/api/users?limit=2')
+        assert cached.data == first.data
+        assert cached.headers['ETag'] == first.headers['ETag']
+        response = client.get('/api/users?limit=2', headers={'If-None-Match': first.headers['ETag']})
+        assert response.status_code == 304
+    
+    # Any user write starts a new generation
+    client.put(f'/api/users/{users[0].id}', json={'first_name': 'Changed'})
+    response = client.get('/api/users?limit=2')
+    assert json.loads(response.data)['users'][0]['first_name'] == 'Changed'
+    assert response.headers['ETag'] != first.headers['ETag']
+    
+    assert client.get('/api/users?after=not-a-cursor').status_code == 400
+
+def test_check_availability(app, client, db, max_queries):
+    """Test availability checks and the duplicate precheck before hashing."""
+    db.session.add(User(username='testuser', email='test@example.com', password_hash='x'))
+    db.session.commit()
+    
+    response = client.get('/api/users/availability?username=testuser&email=free@example.com')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert json.loads(response.data)['available'] == {'username': False, 'email': True}
+    
+    # Names the filter has never seen are answered from memory
+    with max_queries(0):
+        response = client.get('/api/users/availability?username=freeuser')
+        assert json.loads(response.data)['available'] == {'username': True}
+    
+    assert client.get('/api/users/availability').status_code == 400
+    
+    # A duplicate is rejected even while hashing is saturated
+    hasher = PasswordHasher(workers=0, queue_depth=0)
+    app.extensions['password_hasher'] = hasher
+    hasher._slots.acquire()
+    response = client.post(
+        '/api/users',
+        json={'username': 'other', 'email': 'test@example.com', 'password': 'Test123!@#'}
+    )
+    assert response.status_code == 409
+    hasher._slots.release()
+    
+    # Writes are added to the filter as they commit
+    response = client.post(
+        '/api/users',
+        json={'username': 'newuser', 'email': 'new@example.com', 'password': 'Test123!@#'}
+    )
+    assert response.status_code == 201
+    response = client.get('/api/users/availability?username=newuser&email=new@example.com')
+    assert json.loads(response.data)['available'] == {'username': False, 'email': False}
+
+def test_name_filter_resync(app, db):
+    """Test that writes by other workers reach the name filter in bounded time."""
+    now = [0.0]
+    name_filter = UserNameFilter(100, 0.001, GenerationCounter(), sync_seconds=5,
+                                 rebuild_seconds=60, clock=lambda: now[0])
+    with app.app_context():
+        assert not name_filter.might_exist('username', 'late')
+        
+        # Inserted without bumping this worker's generation, as another worker would
+        user = User(username='late', email='late@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        assert not name_filter.might_exist('username', 'late')
+        now[0] = 5
+        assert name_filter.might_exist('username', 'late')
+        
+        # Renames are not caught by the ID sync, only by the rebuild
+        db.session.execute(update(User).where(User.id == user.id).values(username='renamed'))
+        db.session.commit()
+        now[0] = 10
+        assert not name_filter.might_exist('username', 'renamed')
+        now[0] = 60
+        assert name_filter.might_exist('username', 'renamed')
+
+def test_name_filter_build_does_not_block(app, db, monkeypatch):
+    """Test that callers do not wait for a build and writes during it are kept."""
+    name_filter = UserNameFilter(100, 0.001, GenerationCounter())
+    seen = []
+    add_rows = UserNameFilter._add_rows
+
+    def build_rows(bloom, rows, max_id):
+        # Another request while the first build runs: answered at once
+        seen.append(name_filter.might_exist('username', 'anyone'))
+        name_filter.add('during', 'during@example.com')
+        return add_rows(bloom, rows, max_id)
+
+    with app.app_context():
+        monkeypatch.setattr(name_filter, '_add_rows', build_rows)
+        assert not name_filter.might_exist('username', 'free')
+        monkeypatch.undo()
+        assert seen == [True]
+        assert name_filter.might_exist('username', 'during')
+
+        # Without a rebuild period the filter is never rebuilt on a timer
+        assert not name_filter._needs_rebuild(float('inf'))
+
 def test_delete_user(client, db):
     """Test user deletion."""
     # Create test user
@@ -115,6 +311,54 @@ def test_delete_user(client, db):
     response = client.delete(f'/api/users/{user.id}')
     assert response.status_code == 404
 
+def test_deactivate_users(client, db, max_queries):
+    """Test that deactivated users disappear from reads and cannot log in."""
+    users = [
+        User(username=f'user{i}', email=f'user{i}@example.com', password='Test123!@#')
+        for i in range(3)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    ids = [user.id for user in users]
+    
+    # One UPDATE for the whole list; unknown IDs are ignored
+    with max_queries(1):
+        response = client.post('/api/users/deactivate', json={'ids': [ids[0], ids[1], 999999]})
+    assert response.status_code == 200
+    assert json.loads(response.data) == {'deactivated': 2, 'ids': ids[:2]}
+    
+    assert client.get(f'/api/users/{ids[0]}').status_code == 404
+    assert client.put(f'/api/users/{ids[0]}', json={'first_name': 'X'}).status_code == 404
+    listed = [u['id'] for u in json.loads(client.get('/api/users').data)['users']]
+    assert listed == [ids[2]]
+    searched = [u['id'] for u in json.loads(client.get('/api/users/search?q=user').data)['users']]
+    assert searched == [ids[2]]
+    response = client.post('/api/users/login', json={'username': 'user0', 'password': 'Test123!@#'})
+    assert response.status_code == 401
+    
+    assert client.post('/api/users/deactivate', json={'ids': []}).status_code == 400
+    assert client.post('/api/users/deactivate', json={'ids': ['1']}).status_code == 400
+
+def test_purge_deactivated_users(app, db):
+    """Test that purging removes deactivated users and their reports in batches."""
+    users = [
+        User(username=f'user{i}', email=f'user{i}@example.com', password='Test123!@#')
+        for i in range(3)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    ids = [user.id for user in users]
+    UserService.report_user_new({'target_id': ids[0], 'reason': 'spam'})
+    UserService.deactivate_users(ids[:2])
+    
+    # Still within the grace period
+    assert purge_deactivated_users(grace_days=1, batch_size=1) == 0
+    
+    assert purge_deactivated_users(grace_days=-1, batch_size=1) == 2
+    assert [user.id for user in User.query.all()] == [ids[2]]
+    assert Report.query.count() == 0
+    assert ReportCount.query.count() == 0
+
 def test_login(client, db):
     """Test user login."""
     # Create test user
@@ -153,4 +397,242 @@ def test_login(client, db):
             'username': 'testuser'
         }
     )
-    assert response.status_code == 400 
\ No newline at end of file
+    assert response.status_code == 400 
+
+
+def test_get_all_users_pagination(client, db):
+    """Test keyset pagination of the user list."""
+    for i in range(5):
+        db.session.add(User(
+            username=f'user{i}',
+            email=f'user{i}@example.com',
+            password='Test123!@#'
+        ))
+    db.session.commit()
+    
+    # First page
+    response = client.get('/api/users?limit=2')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [u['username'] for u in data['users']] == ['user0', 'user1']
+    assert data['next_cursor']
+    
+    # Walk the remaining pages
+    seen = [u['username'] for u in data['users']]
+    cursor = data['next_cursor']
+    while cursor:
+        response = client.get(f'/api/users?limit=2&after={cursor}')
+        data = json.loads(response.data)
+        seen.extend(u['username'] for u in data['users'])
+        cursor = data['next_cursor']
+    assert seen == [f'user{i}' for i in range(5)]
+    
+    # Invalid parameters
+    assert client.get('/api/users?limit=abc').status_code == 400
+    assert client.get('/api/users?after=not-a-cursor').status_code == 400
+    assert client.get(f'/api/users?after={encode_cursor({"id": True})}').status_code == 400
+
+def test_export_users(client, db):
+    """Test NDJSON export of users."""
+    for i in range(3):
+        db.session.add(User(
+            username=f'user{i}',
+            email=f'user{i}@example.com',
+            password='Test123!@#'
+        ))
+    db.session.commit()
+    
+    response = client.get('/api/users/export')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [row['username'] for row in rows] == ['user0', 'user1', 'user2']
+    
+    # Incremental export
+    response = client.get('/api/users/export?updated_since=2999-01-01T00:00:00')
+    assert response.status_code == 200
+    assert response.data == b''
+    
+    response = client.get('/api/users/export?updated_since=yesterday')
+    assert response.status_code == 400
+
+    # Deactivated users leave the full export but show up in incremental ones
+    since = datetime.utcnow().isoformat()
+    assert UserService.delete_user(rows[0]['id'])
+    response = client.get('/api/users/export')
+    assert [json.loads(line)['username'] for line in response.data.decode().splitlines()] == ['user1', 'user2']
+    response = client.get(f'/api/users/export?updated_since={since}')
+    rows = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [(row['username'], row['is_active']) for row in rows] == [('user0', False)]
+
+def test_bulk_create_users(client, db):
+    """Test bulk user creation with per-item results."""
+    db.session.add(User(
+        username='existing',
+        email='existing@example.com',
+        password='Test123!@#'
+    ))
+    db.session.commit()
+    
+    response = client.post(
+        '/api/users/bulk',
+        json=[
+            {'username': 'bulk1', 'email': 'bulk1@example.com', 'password': 'Test123!@#'},
+            {'username': 'bulk2', 'email': 'bulk2@example.com', 'password': 'weak'},
+            {'username': 'existing', 'email': 'other@example.com', 'password': 'Test123!@#'},
+            {'username': 'bulk1', 'email': 'bulk1b@example.com', 'password': 'Test123!@#'},
+            {'username': 'bulk3', 'email': 'bulk3@example.com', 'password': 'Test123!@#'}
+        ]
+    )
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['created'] == 2
+    assert [r['status'] for r in data['results']] == [
+        'created', 'invalid', 'conflict', 'conflict', 'created'
+    ]
+    assert data['results'][4]['user']['username'] == 'bulk3'
+    
+    # Created users can log in
+    response = client.post(
+        '/api/users/login',
+        json={'username': 'bulk3', 'password': 'Test123!@#'}
+    )
+    assert response.status_code == 200
+    
+    # Body must be a list
+    response = client.post('/api/users/bulk', json={'username': 'bulk4'})
+    assert response.status_code == 400
+
+def test_login_hashing_backpressure(app, client, db):
+    """Test that login fails fast when the hashing queue is full."""
+    user = User(
+        username='testuser',
+        email='test@example.com',
+        password='Test123!@#'
+    )
+    db.session.add(user)
+    db.session.commit()
+    
+    hasher = PasswordHasher(workers=0, queue_depth=0, retry_after=3)
+    app.extensions['password_hasher'] = hasher
+    
+    # Occupy the only slot, as a concurrent hash would
+    hasher._slots.acquire()
+    response = client.post(
+        '/api/users/login',
+        json={'username': 'testuser', 'password': 'Test123!@#'}
+    )
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+    
+    # Reads are unaffected
+    assert client.get(f'/api/users/{user.id}').status_code == 200
+    
+    hasher._slots.release()
+    response = client.post(
+        '/api/users/login',
+        json={'username': 'testuser', 'password': 'Test123!@#'}
+    )
+    assert response.status_code == 200
+
+def test_user_cache_invalidation(app, client, db):
+    """Test that cached users are invalidated on update and delete."""
+    user = User(
+        username='testuser',
+        email='test@example.com',
+        password='Test123!@#'
+    )
+    db.session.add(user)
+    db.session.commit()
+    user_id = user.id
+    
+    client.get(f'/api/users/{user_id}')
+    client.get(f'/api/users/{user_id}')
+    stats = json.loads(client.get('/api/users/cache/stats').data)['cache']
+    assert stats['hits'] >= 1
+    
+    # Username change drops both the id and the old username entries
+    client.put(f'/api/users/{user_id}', json={'username': 'renamed'})
+    data = json.loads(client.get(f'/api/users/{user_id}').data)
+    assert data['user']['username'] == 'renamed'
+    with app.app_context():
+        assert UserService.get_user_by_username('testuser') is None
+        assert UserService.get_user_by_username('renamed')['id'] == user_id
+    
+    # Writes in another worker sharing the generation drop cached users
+    with app.app_context():
+        UserService.get_user_by_username('renamed')
+        app.extensions['user_cache'].generation.bump()
+        db.session.execute(update(User).where(User.id == user_id).values(username='elsewhere'))
+        db.session.commit()
+        assert UserService.get_user_by_username('renamed') is None
+        assert UserService.get_user_by_id(user_id)['username'] == 'elsewhere'
+    
+    client.delete(f'/api/users/{user_id}')
+    assert client.get(f'/api/users/{user_id}').status_code == 404
+
+def test_search_users(app, client, db, monkeypatch):
+    """Test ranked prefix search with keyset pagination."""
+    for username, first_name in (('anna', 'Zoe'), ('annabel', None), ('bob', 'Anneke'), ('carl', None)):
+        db.session.add(User(
+            username=username,
+            email=f'{username}@example.com',
+            password='Test123!@#',
+            first_name=first_name
+        ))
+    db.session.commit()
+    
+    response = client.get('/api/users/search?q=ann')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [u['username'] for u in data['users']] == ['anna', 'annabel', 'bob']
+    
+    # Exact username ranks first; pages follow the ranking
+    response = client.get('/api/users/search?q=anna&limit=1')
+    data = json.loads(response.data)
+    assert [u['username'] for u in data['users']] == ['anna']
+    response = client.get(f"/api/users/search?q=anna&limit=1&after={data['next_cursor']}")
+    data = json.loads(response.data)
+    assert [u['username'] for u in data['users']] == ['annabel']
+    assert data['next_cursor'] is None
+    
+    # New users are searchable immediately
+    client.post('/api/users', json={
+        'username': 'annette',
+        'email': 'annette@example.com',
+        'password': 'Test123!@#'
+    })
+    data = json.loads(client.get('/api/users/search?q=annet').data)
+    assert [u['username'] for u in data['users']] == ['annette']
+    
+    # Writes by other workers show once the shared generation moves; a
+    # failed rebuild is retried by the next search
+    db.session.execute(update(User).where(User.username == 'carl').values(first_name='Annika'))
+    db.session.commit()
+    index = app.extensions['user_search_index']
+    index.generation.bump()
+    rebuild = index._rebuild
+    def failing_rebuild():
+        monkeypatch.setattr(index, '_rebuild', rebuild)
+        raise RuntimeError('database is down')
+    monkeypatch.setattr(index, '_rebuild', failing_rebuild)
+    assert client.get('/api/users/search?q=anni').status_code == 500
+    data = json.loads(client.get('/api/users/search?q=anni').data)
+    assert [u['username'] for u in data['users']] == ['carl']
+    
+    assert client.get('/api/users/search').status_code == 400
+
+def test_user_endpoint_query_budgets(client, db, max_queries):
+    """Test that list and search endpoints do not issue N+1 queries."""
+    for i in range(10):
+        db.session.add(User(
+            username=f'budget{i}',
+            email=f'budget{i}@example.com',
+            password='Test123!@#'
+        ))
+    db.session.commit()
+    
+    with max_queries(2):
+        assert client.get('/api/users?limit=10').status_code == 200
+    with max_queries(3):
+        assert client.get('/api/users/search?q=budget').status_code == 200
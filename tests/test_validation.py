@@ -0,0 +1,58 @@
+"""Request validation tests."""
+import re
+import pytest
+from marshmallow import ValidationError
+from app.schemas.request.report_request_dto import ReportRequestDTO
+from app.schemas.user_schema import UserSchema
+from app.schemas.validation import get_schema
+
+def _legacy_password_error(value):
+    """Reference implementation of the original regex-based check."""
+    if not re.search(r'[A-Z]', value):
+        return 'Password must contain at least one uppercase letter'
+    if not re.search(r'[a-z]', value):
+        return 'Password must contain at least one lowercase letter'
+    if not re.search(r'[0-9]', value):
+        return 'Password must contain at least one number'
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', value):
+        return 'Password must contain at least one special character'
+    return None
+
+@pytest.mark.parametrize('password', [
+    'Test123!@#', 'test123!@#', 'TEST123!@#', 'Testabc!@#', 'Test12345',
+    'ÄÖÜäöü123!', 'Test١٢٣!@#', 'weak', '', '        '
+])
+def test_password_errors_unchanged(password):
+    """Test that the single-pass check reports the same first error."""
+    try:
+        UserSchema().validate_password(password)
+        error = None
+    except ValidationError as e:
+        error = e.messages[0]
+    assert error == _legacy_password_error(password)
+
+def test_schemas_are_cached():
+    """Test that one instance is built per schema configuration."""
+    assert get_schema(UserSchema) is get_schema(UserSchema)
+    assert get_schema(UserSchema, partial=True) is get_schema(UserSchema, partial=True)
+    assert get_schema(UserSchema, partial=True) is not get_schema(UserSchema)
+    assert get_schema(UserSchema, partial=True).partial is True
+    assert isinstance(get_schema(ReportRequestDTO), ReportRequestDTO)
+
+def test_requests_reuse_schemas(client, db, monkeypatch):
+    """Test that validating requests does not build schemas once warmed up."""
+    data = {'username': 'testuser', 'email': 'test@example.com', 'password': 'Test123!@#'}
+    client.post('/api/users', json=data)
+    client.put('/api/users/1', json={'first_name': 'Test'})
+
+    built = []
+    init = UserSchema.__init__
+    def counting_init(self, *args, **kwargs):
+        built.append(type(self))
+        init(self, *args, **kwargs)
+    monkeypatch.setattr(UserSchema, '__init__', counting_init)
+
+    assert client.post('/api/users', json={**data, 'username': 'other', 'email': 'other@example.com'}).status_code == 201
+    assert client.put('/api/users/1', json={'first_name': 'Again'}).status_code == 200
+    assert client.post('/api/users', json={'username': 'x'}).status_code == 400
+    assert built == []